@@ -0,0 +1,219 @@
+import os
+from collections import OrderedDict
+import numpy as np
+import pygame
+from render_backend import track_surface
+
+HEATMAP_BINS = (80, 55)  # Columns x rows over the play area
+DISTANCE_BIN = 5  # Pixels per bucket of the distance-between-shots histogram
+DISTANCE_BINS = 240  # Covers the screen diagonal; longer gaps land in the last bucket
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analytics_cache.npz')
+CHUNK_SIZE = 200000  # Shots read from the database per query
+MAX_LAST_POSITIONS = 5000  # Most recently active player-in-match keys kept to link gaps across chunks
+
+class ShotAnalytics:
+    """Shot heatmap and per-player accuracy/spacing statistics, updated incrementally.
+
+    Only shots newer than the last processed shot_id are read on update(), and
+    the aggregates are persisted so the next run resumes where this one stopped.
+    The cache records which database and which last shot it was built from, and
+    is thrown away if the database at update time is a different one.
+    """
+    def __init__(self, screen_width, screen_height, hud_height=50, bins=HEATMAP_BINS, cache_path=CACHE_PATH):
+        self.x_edges = np.linspace(0, screen_width, bins[0] + 1)
+        self.y_edges = np.linspace(hud_height, screen_height, bins[1] + 1)
+        self.cache_path = cache_path
+        self.bins = bins
+        self.surface_cache = {}
+        self.reset()
+        self.load_cache()
+
+    def reset(self):
+        """Clears the aggregates, e.g. when the cache belongs to another database."""
+        self.heatmap = np.zeros(self.bins, dtype=np.int64)
+        self.last_shot_id = 0
+        self.last_shot_key = ''  # match_uuid|player_uuid of shot last_shot_id, to recognise the database
+        self.database = ''
+        self.player_uuids = []
+        self.player_rows = {}
+        self.counts = np.zeros((0, 2), dtype=np.int64)  # shots, hits
+        self.distances = np.zeros((0, DISTANCE_BINS), dtype=np.int64)
+        self.last_positions = OrderedDict()  # (match_uuid, player_uuid) -> (x, y) of the last shot, oldest first
+        self.surface_cache.clear()
+
+    def load_cache(self):
+        """Restores aggregates from disk if the cache matches the current bin layout."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        with np.load(self.cache_path, allow_pickle=False) as data:
+            if data['heatmap'].shape != self.heatmap.shape or 'database' not in data:
+                return
+            self.heatmap = data['heatmap']
+            self.last_shot_id = int(data['last_shot_id'])
+            self.last_shot_key = str(data['last_shot_key'])
+            self.database = str(data['database'])
+            self.player_uuids = [str(u) for u in data['player_uuids']]
+            self.counts = data['counts']
+            self.distances = data['distances']
+            keys, positions = data['last_keys'], data['last_positions']
+            self.last_positions = OrderedDict(((str(m), str(p)), tuple(xy)) for (m, p), xy in zip(keys, positions))
+        self.player_rows = {uuid: row for row, uuid in enumerate(self.player_uuids)}
+
+    def save_cache(self):
+        """Writes the aggregates next to the database."""
+        if not self.cache_path:
+            return
+        keys = np.array(list(self.last_positions.keys()), dtype=str).reshape(-1, 2)
+        positions = np.array(list(self.last_positions.values()), dtype=float).reshape(-1, 2)
+        with open(self.cache_path, 'wb') as f:
+            np.savez(f, heatmap=self.heatmap, last_shot_id=self.last_shot_id,
+                     last_shot_key=self.last_shot_key, database=self.database,
+                     player_uuids=np.array(self.player_uuids, dtype=str), counts=self.counts,
+                     distances=self.distances, last_keys=keys, last_positions=positions)
+
+    def matches_database(self, conn, database):
+        """Whether the aggregates were built from this database file and its shot ids."""
+        if not self.last_shot_id:
+            return True
+        if database != self.database:
+            return False
+        row = conn.execute("SELECT match_uuid, player_uuid FROM shots WHERE shot_id = ?",
+                           (self.last_shot_id,)).fetchone()
+        return row is not None and f"{row[0]}|{row[1]}" == self.last_shot_key
+
+    def update(self, conn, max_rows=None):
+        """Folds shots recorded since the last update into the aggregates.
+
+        With max_rows, stops after at most that many shots so a caller can spread a large
+        backlog over several frames; the cache is written once it has caught up.
+        """
+        c = conn.cursor()
+        database = os.path.abspath(c.execute("PRAGMA database_list").fetchone()[2] or '')
+        if not self.matches_database(conn, database):
+            print(f"Shot analytics cache is from another database; rebuilding from {database}")
+            self.reset()
+        self.database = database
+        added = 0
+        while max_rows is None or added < max_rows:
+            limit = CHUNK_SIZE if max_rows is None else min(CHUNK_SIZE, max_rows - added)
+            c.execute("""
+                SELECT shot_id, match_uuid, player_uuid, x, y, hit FROM shots
+                WHERE shot_id > ? ORDER BY shot_id LIMIT ?
+            """, (self.last_shot_id, limit))
+            rows = c.fetchall()
+            if not rows:
+                break
+            shot_ids, match_uuids, player_uuids, x, y, hits = zip(*rows)
+            self.add_shots(np.array(match_uuids, dtype=str), np.array(player_uuids, dtype=str),
+                           np.array(x, dtype=float), np.array(y, dtype=float), np.array(hits, dtype=bool))
+            self.last_shot_id = shot_ids[-1]
+            self.last_shot_key = f"{match_uuids[-1]}|{player_uuids[-1]}"
+            added += len(rows)
+            if len(rows) < limit:
+                break
+        if added:
+            self.surface_cache.clear()
+            if self.caught_up(conn):
+                self.save_cache()
+        return added
+
+    def caught_up(self, conn):
+        """Whether every recorded shot has been aggregated."""
+        return conn.execute("SELECT 1 FROM shots WHERE shot_id > ? LIMIT 1", (self.last_shot_id,)).fetchone() is None
+
+    def add_shots(self, match_uuids, player_uuids, x, y, hits):
+        """Aggregates a chunk of shots given in recording order."""
+        histogram, _, _ = np.histogram2d(x, y, bins=[self.x_edges, self.y_edges])
+        self.heatmap += histogram.astype(np.int64)
+
+        uuids, inverse = np.unique(player_uuids, return_inverse=True)
+        rows = np.array([self.player_row(uuid) for uuid in uuids])[inverse]
+        size = len(self.player_uuids)
+        self.counts[:, 0] += np.bincount(rows, minlength=size)
+        self.counts[:, 1] += np.bincount(rows, weights=hits.astype(float), minlength=size).astype(np.int64)
+
+        # Gaps between consecutive shots of the same player in the same match
+        keys = np.char.add(np.char.add(match_uuids, "|"), player_uuids)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys, sx, sy, srows = keys[order], x[order], y[order], rows[order]
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        gaps = np.hypot(np.diff(sx), np.diff(sy))[same]
+        gap_rows = srows[1:][same]
+
+        # Link the first shot of each group to the last shot seen in an earlier chunk
+        starts = np.flatnonzero(np.concatenate(([True], ~same)))
+        ends = np.concatenate((starts[1:], [len(sorted_keys)])) - 1
+        carried = []
+        carried_rows = []
+        for start in starts:
+            key = tuple(sorted_keys[start].split("|", 1))
+            previous = self.last_positions.get(key)
+            if previous is not None:
+                carried.append(np.hypot(sx[start] - previous[0], sy[start] - previous[1]))
+                carried_rows.append(srows[start])
+        if carried:
+            gaps = np.concatenate((gaps, carried))
+            gap_rows = np.concatenate((gap_rows, carried_rows))
+        buckets = np.minimum((gaps // DISTANCE_BIN).astype(np.int64), DISTANCE_BINS - 1)
+        np.add.at(self.distances, (gap_rows, buckets), 1)
+
+        # A match can continue later (e.g. a resumed save), so last positions outlive the
+        # chunk; the least recently active keys are expired so the cache stays bounded
+        for start, end in zip(starts, ends):
+            key = tuple(sorted_keys[start].split("|", 1))
+            self.last_positions.pop(key, None)
+            self.last_positions[key] = (float(sx[end]), float(sy[end]))
+        while len(self.last_positions) > MAX_LAST_POSITIONS:
+            self.last_positions.popitem(last=False)
+
+    def player_row(self, uuid):
+        """Returns the aggregate row for a player, growing the arrays for new players."""
+        row = self.player_rows.get(uuid)
+        if row is None:
+            row = len(self.player_uuids)
+            self.player_uuids.append(uuid)
+            self.player_rows[uuid] = row
+            self.counts = np.vstack((self.counts, np.zeros((1, 2), dtype=np.int64)))
+            self.distances = np.vstack((self.distances, np.zeros((1, DISTANCE_BINS), dtype=np.int64)))
+        return row
+
+    def player_stats(self, uuid):
+        """Returns shots, accuracy and median/p90 distance between shots for a player."""
+        row = self.player_rows.get(uuid)
+        if row is None:
+            return None
+        shots, hits = self.counts[row]
+        histogram = self.distances[row]
+        total = histogram.sum()
+        stats = {'shots': int(shots), 'accuracy': float(hits / shots) if shots else 0.0,
+                 'median_distance': None, 'p90_distance': None}
+        if total:
+            cumulative = np.cumsum(histogram)
+            centers = (np.arange(DISTANCE_BINS) + 0.5) * DISTANCE_BIN
+            stats['median_distance'] = float(centers[np.searchsorted(cumulative, total * 0.5)])
+            stats['p90_distance'] = float(centers[np.searchsorted(cumulative, total * 0.9)])
+        return stats
+
+    def top_players(self, count=3):
+        """Returns the uuids of the players with the most recorded shots."""
+        order = np.argsort(-self.counts[:, 0], kind='stable')[:count]
+        return [self.player_uuids[row] for row in order]
+
+    def heatmap_surface(self, size):
+        """Renders the heatmap as a translucent surface, cached until new shots arrive."""
+        if size in self.surface_cache:
+            return self.surface_cache[size]
+        intensity = np.log1p(self.heatmap.astype(float))
+        if intensity.max() > 0:
+            intensity /= intensity.max()
+        rgb = np.zeros(intensity.shape + (3,), dtype=np.uint8)
+        rgb[..., 0] = (255 * np.clip(intensity * 2, 0, 1)).astype(np.uint8)
+        rgb[..., 1] = (255 * np.clip(intensity * 2 - 1, 0, 1)).astype(np.uint8)
+        surface = pygame.Surface(intensity.shape, pygame.SRCALPHA)
+        pygame.surfarray.blit_array(surface, rgb)
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[:] = (40 + 200 * intensity).astype(np.uint8) * (self.heatmap > 0)
+        del alpha  # Unlocks the surface
+        scaled = track_surface(pygame.transform.smoothscale(surface, size))
+        self.surface_cache[size] = scaled
+        return scaled
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import queue
+import threading
+import pygame
+import pyttsx3
+
+CACHE_DIR = os.environ.get('SHOOTER_TTS_CACHE', 'tts_cache')
+VOICE = os.environ.get('SHOOTER_TTS_VOICE')  # pyttsx3 voice id; the engine default if unset
+ANNOUNCER_GROUP = "announcer"
+COUNTDOWN_PHRASES = ["3", "2", "1", "Go!"]
+ITEM_PHRASES = {
+    'TimeBonusItem': "Extra time!",
+    'ScoreMultiplierItem': "Double points!",
+    'FreezeOpponentItem': "Freeze!",
+    'ExtraBulletsItem': "Extra bullets!"
+}
+DRAW_PHRASE = "Game over. It's a draw!"
+FIXED_PHRASES = COUNTDOWN_PHRASES + list(ITEM_PHRASES.values()) + ["Game over!", DRAW_PHRASE]
+
+def winner_phrase(name):
+    """The game-over line for a winner; prepared as soon as the players are known."""
+    return f"Game over. {name} wins!"
+
+class Announcer:
+    """Speaks short phrases from pre-synthesized audio cached on disk.
+
+    pyttsx3 blocks while it synthesizes, so it only runs on a worker thread;
+    say() never waits and simply skips a phrase that is not ready yet.
+    """
+    def __init__(self, audio, group=ANNOUNCER_GROUP, cache_dir=CACHE_DIR, voice=VOICE):
+        self.audio = audio
+        self.group = group
+        self.cache_dir = cache_dir
+        self.voice = voice
+        self.requested = set()
+        self.ready = set()
+        self.jobs = queue.Queue()
+        self.enabled = True  # Cleared if no speech engine is available
+        self.worker = threading.Thread(target=self._run, name="announcer", daemon=True)
+        self.worker.start()
+        self.prepare(FIXED_PHRASES)
+
+    def prepare(self, phrases):
+        """Queues phrases for synthesis ahead of need; already requested ones are skipped."""
+        for text in phrases:
+            if text not in self.requested:
+                self.requested.add(text)
+                self.jobs.put(text)
+
+    def prepare_players(self, users):
+        """Prepares the phrases that mention players, e.g. right after they log in."""
+        self.prepare([winner_phrase(user.username) for user in users])
+
+    def say(self, text):
+        """Plays a phrase if it is ready; returns False (and queues it) if not."""
+        if text in self.ready:
+            self.audio.play(self.sound_name(text), self.group)
+            return True
+        if self.enabled:
+            self.prepare([text])
+        return False
+
+    def announce_pickup(self, target):
+        """Announces a special item by its type."""
+        text = ITEM_PHRASES.get(type(target).__name__)
+        if text:
+            self.say(text)
+
+    def announce_result(self, players):
+        """Announces the winner, or a draw."""
+        best = max(player.score for player in players)
+        winners = [player for player in players if player.score == best]
+        self.say(winner_phrase(winners[0].name) if len(winners) == 1 else DRAW_PHRASE)
+
+    def sound_name(self, text):
+        return f"say:{text}"
+
+    def cache_path(self, text, voice):
+        """Cache file for a phrase, keyed by the text and the voice that spoke it."""
+        key = hashlib.sha1(f"{voice}\n{text}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.wav')
+
+    def _run(self):
+        engine = None  # Created on first cache miss; it must stay on this thread
+        os.makedirs(self.cache_dir, exist_ok=True)
+        while True:
+            text = self.jobs.get()
+            if text is None:
+                break
+            try:
+                engine = self._load(text, engine)
+            except Exception as e:  # One bad phrase must not silence the rest
+                print(f"Announcer could not prepare {text!r}: {e}")
+                engine = None  # Start a fresh engine in case this one is stuck
+            if text not in self.ready:
+                self.requested.discard(text)  # Let the next say() queue it again
+
+    def _load(self, text, engine):
+        """Synthesizes a phrase unless cached and adds it to the sound bank; returns the engine."""
+        path = self.cache_path(text, self.voice or 'default')
+        if not os.path.exists(path):
+            engine = engine or self._engine()
+            if engine is None:
+                return None
+            partial = path + '.part.wav'
+            engine.save_to_file(text, partial)
+            engine.runAndWait()
+            if not os.path.exists(partial):
+                return engine
+            os.replace(partial, path)
+        try:
+            self.audio.add(self.sound_name(text), pygame.mixer.Sound(path))
+        except pygame.error:
+            os.remove(path)  # Unreadable output; synthesized again when next asked for
+            return engine
+        self.ready.add(text)
+        return engine
+
+    def _engine(self):
+        if not self.enabled:
+            return None
+        try:
+            engine = pyttsx3.init()
+        except Exception as e:  # No speech backend (e.g. eSpeak missing): stay silent
+            print(f"Announcer disabled: {e}")
+            self.enabled = False
+            return None
+        if self.voice:
+            engine.setProperty('voice', self.voice)
+        return engine
+
+    def close(self):
+        """Stops the worker after the phrase it is synthesizing."""
+        self.jobs.put(None)
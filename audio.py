@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+import pygame
+
+AUDIO_FREQUENCY = 44100
+AUDIO_SIZE = -16
+AUDIO_CHANNELS = 2
+AUDIO_BUFFER = int(os.environ.get('SHOOTER_AUDIO_BUFFER', 256))  # Samples per mixer buffer
+VOICES_PER_GROUP = 2  # Simultaneous sounds allowed per player
+MEASURE_TRIALS = 20  # Silent sounds timed by measure_latency()
+MEASURE_EVENT = pygame.event.custom_type()  # Channel end event used while measuring
+
+
+def pre_init(buffer=AUDIO_BUFFER, frequency=AUDIO_FREQUENCY):
+    """Configures a small mixer buffer; must be called before pygame.init()."""
+    pygame.mixer.pre_init(frequency, AUDIO_SIZE, AUDIO_CHANNELS, buffer)
+
+
+class Voice:
+    """A named sound bound to a channel group, usable wherever a Sound is played."""
+    def __init__(self, manager, name, group):
+        self.manager = manager
+        self.name = name
+        self.group = group
+
+    def play(self):
+        """Plays the sound on one of the group's reserved channels."""
+        return self.manager.play(self.name, self.group)
+
+
+class AudioManager:
+    """Owns the sound bank and hands out reserved channels per player group."""
+    def __init__(self, groups, voices_per_group=VOICES_PER_GROUP, buffer=AUDIO_BUFFER):
+        self.buffer = buffer
+        self.volume = 1.0
+        self.bank = {}
+        self.groups = {}
+        self.started = {}  # Channel -> time it last started, used for voice stealing
+        reserved = len(groups) * voices_per_group
+        pygame.mixer.set_num_channels(max(8, reserved + 4))
+        pygame.mixer.set_reserved(reserved)
+        index = 0
+        for group in groups:
+            channels = []
+            for _ in range(voices_per_group):
+                channel = pygame.mixer.Channel(index)
+                channels.append(channel)
+                self.started[channel] = 0.0
+                index += 1
+            self.groups[group] = channels
+
+    def load(self, name, path):
+        """Decodes a sound file once and stores it in the bank."""
+        return self.add(name, pygame.mixer.Sound(path))
+
+    def add(self, name, sound):
+        """Adds an already decoded sound to the bank at the current volume."""
+        sound.set_volume(self.volume)
+        self.bank[name] = sound
+        return sound
+
+    def voice(self, name, group):
+        """Returns a playable handle for a bank sound routed to a group."""
+        return Voice(self, name, group)
+
+    def play(self, name, group):
+        """Plays a bank sound on a free group channel, stealing the oldest if all are busy."""
+        channels = self.groups[group]
+        channel = next((ch for ch in channels if not ch.get_busy()), None)
+        if channel is None:
+            channel = min(channels, key=self.started.get)
+        channel.play(self.bank[name])
+        self.started[channel] = time.perf_counter()
+        return channel
+
+    def set_volume(self, volume):
+        """Applies a volume to every sound in the bank."""
+        self.volume = volume
+        for sound in list(self.bank.values()):  # The announcer may add sounds from its thread
+            sound.set_volume(volume)
+
+    def buffer_latency_ms(self):
+        """Returns the duration of one mixer buffer at the negotiated sample rate."""
+        frequency = pygame.mixer.get_init()[0]
+        return self.buffer * 1000.0 / frequency
+
+    def measure_latency(self, trials=MEASURE_TRIALS, length_ms=20):
+        """Measures the median delay from play() until a sound reaches the output, in ms.
+
+        A short silent sound is played on an unreserved channel and timed until its end
+        event; the end event fires once its last sample is mixed, and that buffer still
+        has to be played out, so one buffer is added. Driver and device latency beyond
+        SDL's buffer is not visible here.
+        """
+        frequency, _, channels = pygame.mixer.get_init()
+        samples = int(frequency * length_ms / 1000)
+        sound = pygame.mixer.Sound(buffer=bytes(samples * channels * 2))
+        channel = pygame.mixer.Channel(pygame.mixer.get_num_channels() - 1)
+        channel.set_endevent(MEASURE_EVENT)
+        delays = []
+        for _ in range(trials):
+            pygame.event.clear(MEASURE_EVENT)
+            started = time.perf_counter()
+            channel.play(sound)
+            while not pygame.event.get(MEASURE_EVENT):
+                if time.perf_counter() - started > 1.0:  # No end event: the mixer is not running
+                    break
+                time.sleep(0.0005)
+            else:
+                delays.append((time.perf_counter() - started - sound.get_length()) * 1000.0)
+        channel.set_endevent()
+        if not delays:
+            return None
+        return max(0.0, sorted(delays)[len(delays) // 2]) + self.buffer_latency_ms()
+
+
+if __name__ == "__main__":
+    # Usage: python audio.py [buffer ...] - measures play-to-output latency for each buffer size
+    pygame.init()
+    for size in [int(arg) for arg in sys.argv[1:]] or [AUDIO_BUFFER]:
+        pygame.mixer.quit()
+        pre_init(buffer=size)
+        pygame.mixer.init()
+        manager = AudioManager(["test"], buffer=size)
+        latency = manager.measure_latency()
+        measured = f"{latency:.2f} ms measured" if latency is not None else "not measurable (no end events)"
+        print(f"buffer={size}: {measured}, {manager.buffer_latency_ms():.2f} ms per mixer buffer")
+    pygame.quit()
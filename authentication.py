@@ -2,6 +2,7 @@ import pygame
 import sqlite3
 import uuid
 from user import User
+from render_backend import present, load_font
 
 def draw_text(screen, text, pos, font, color=(0, 0, 0)):
     """Utility function to render text on the screen."""
@@ -10,7 +11,7 @@ def draw_text(screen, text, pos, font, color=(0, 0, 0)):
 
 def get_text_input(screen, prompt, background_image):
     """Collects text input from the user with a back option."""
-    font = pygame.font.Font(None, 32)
+    font = load_font(32)
     input_box = pygame.Rect(300, 300, 200, 32)
     back_rect = pygame.Rect(300, 340, 100, 32)
     color_inactive = pygame.Color('lightskyblue3')
@@ -49,12 +50,12 @@ def get_text_input(screen, prompt, background_image):
         pygame.draw.rect(screen, color, input_box, 2)
         pygame.draw.rect(screen, (255, 0, 0), back_rect)
         draw_text(screen, "Back", (back_rect.x + 20, back_rect.y + 5), font)
-        pygame.display.flip()
+        present()
         clock.tick(30)
 
 def get_password_input(screen, prompt, background_image):
     """Collects password input with asterisks and a back option."""
-    font = pygame.font.Font(None, 32)
+    font = load_font(32)
     input_box = pygame.Rect(300, 300, 200, 32)
     back_rect = pygame.Rect(300, 340, 100, 32)
     color_inactive = pygame.Color('lightskyblue3')
@@ -96,10 +97,10 @@ def get_password_input(screen, prompt, background_image):
         pygame.draw.rect(screen, color, input_box, 2)
         pygame.draw.rect(screen, (255, 0, 0), back_rect)
         draw_text(screen, "Back", (back_rect.x + 20, back_rect.y + 5), font)
-        pygame.display.flip()
+        present()
         clock.tick(30)
 
-def sign_up_screen(screen, conn, background_image):
+def sign_up_screen(screen, db, background_image):
     """Handles user sign-up."""
     while True:
         username = get_text_input(screen, "Enter username:", background_image)
@@ -112,21 +113,19 @@ def sign_up_screen(screen, conn, background_image):
             return None
         if not password:
             continue
-        c = conn.cursor()
         try:
             user_uuid = str(uuid.uuid4())
-            c.execute("INSERT INTO users (uuid, username, password) VALUES (?, ?, ?)",
-                      (user_uuid, username, password))
-            conn.commit()
+            db.execute("INSERT INTO users (uuid, username, password) VALUES (?, ?, ?)",
+                       (user_uuid, username, password))
             return User(user_uuid, username, password)
         except sqlite3.IntegrityError:
             screen.blit(background_image, (0, 0))
-            font = pygame.font.Font(None, 32)
+            font = load_font(32)
             draw_text(screen, "Username already taken.", (300, 400), font, (255, 0, 0))
-            pygame.display.flip()
+            present()
             pygame.time.wait(2000)
 
-def login_screen(screen, conn, background_image):
+def login_screen(screen, db, background_image):
     """Handles user login."""
     while True:
         username = get_text_input(screen, "Enter username:", background_image)
@@ -137,24 +136,21 @@ def login_screen(screen, conn, background_image):
         password = get_password_input(screen, "Enter password:", background_image)
         if password is None:
             return None
-        c = conn.cursor()
-        c.execute("SELECT uuid, username, password FROM users WHERE username = ?", (username,))
-        user_data = c.fetchone()
+        user_data = db.query_one("SELECT uuid, username, password FROM users WHERE username = ?", (username,))
         if user_data and user_data[2] == password:
             return User(user_data[0], user_data[1], user_data[2])
         screen.blit(background_image, (0, 0))
-        font = pygame.font.Font(None, 32)
+        font = load_font(32)
         draw_text(screen, "Invalid username or password.", (300, 400), font, (255, 0, 0))
-        pygame.display.flip()
+        present()
         pygame.time.wait(2000)
 
-def authenticate_players(screen, conn, background_image, settings_screen, leaderboard_screen,
+def authenticate_players(screen, db, background_image, settings_screen, leaderboard_screen,
                          control_schemes, player1_controls, player2_controls, sound_volume,
-                         shoot_sound, hit_sound, allow_signup=True):
-    """Authenticate two players with options for sign-up, login, settings, and leaderboard."""
-    font = pygame.font.Font(None, 32)
-    player1 = None
-    player2 = None
+                         audio, allow_signup=True, player_count=2):
+    """Authenticate player_count players with options for sign-up, login, settings, and leaderboard."""
+    font = load_font(32)
+    players = []
     clock = pygame.time.Clock()
     SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
 
@@ -181,19 +177,16 @@ def authenticate_players(screen, conn, background_image, settings_screen, leader
         buttons.append((text, rect, color, action))
 
     while True:
-        if not player1:
-            prompt = "Player 1: Choose an option"
-        elif not player2:
-            prompt = "Player 2: Choose an option"
-        else:
-            return player1, player2
+        if len(players) == player_count:
+            return tuple(players)
+        prompt = f"Player {len(players) + 1}: Choose an option"
 
         screen.blit(background_image, (0, 0))
         draw_text(screen, prompt, (300, 120), font)
         for text, rect, color, _ in buttons:
             pygame.draw.rect(screen, color, rect)
             draw_text(screen, text, (rect.x + 10, rect.y + 15), font)
-        pygame.display.flip()
+        present()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -203,24 +196,20 @@ def authenticate_players(screen, conn, background_image, settings_screen, leader
                 for _, rect, _, action in buttons:
                     if rect.collidepoint(event.pos):
                         if action == "signup" and allow_signup:
-                            user = sign_up_screen(screen, conn, background_image)
-                            if user and not player1:
-                                player1 = user
-                            elif user and not player2 and user.uuid != player1.uuid:
-                                player2 = user
+                            user = sign_up_screen(screen, db, background_image)
+                            if user and all(user.uuid != p.uuid for p in players):
+                                players.append(user)
                         elif action == "login":
-                            user = login_screen(screen, conn, background_image)
-                            if user and not player1:
-                                player1 = user
-                            elif user and not player2 and user.uuid != player1.uuid:
-                                player2 = user
+                            user = login_screen(screen, db, background_image)
+                            if user and all(user.uuid != p.uuid for p in players):
+                                players.append(user)
                         elif action == "settings":
                             player1_controls, player2_controls, sound_volume = settings_screen(
                                 screen, control_schemes, player1_controls, player2_controls,
-                                sound_volume, shoot_sound, hit_sound, background_image
+                                sound_volume, audio, background_image
                             )
                         elif action == "leaderboard":
-                            leaderboard_screen(screen, conn, background_image)
+                            leaderboard_screen(screen, db, background_image)
                         elif action == "back":
-                            return None, None
+                            return (None,) * player_count
         clock.tick(30)
\ No newline at end of file
@@ -0,0 +1,69 @@
+# Benchmarks per-tick arena cost (update, aim, shots and draw) for 2 to 8 players.
+# Usage: python bench_arena.py [ticks]
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from game import Game, PLAYER_COLORS
+from player import Player
+from render_backend import SurfaceBackend
+from user import User
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+
+class SilentSound:
+    """Stands in for a mixer voice so the benchmark measures game logic only."""
+    def play(self):
+        pass
+
+def make_game(player_count):
+    """Builds an arena with generated users and one control scheme per seat."""
+    players = []
+    for i in range(player_count):
+        controls = {"up": 1000 + i * 5, "down": 1001 + i * 5, "left": 1002 + i * 5,
+                    "right": 1003 + i * 5, "shoot": 1004 + i * 5}
+        user = User(f"bench-{i}", f"P{i + 1}", "")
+        players.append(Player(user, controls, PLAYER_COLORS[i], SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(players, SCREEN_WIDTH, SCREEN_HEIGHT)
+    for player in game.players:
+        player.start_timer()
+        player.bullets = 10 ** 9
+    game.is_new = False
+    return game
+
+def run(player_count, ticks, backend, background, font):
+    """Returns the mean and worst tick time in microseconds."""
+    random.seed(player_count)
+    game = make_game(player_count)
+    sound = SilentSound()
+    held = {}
+    timings = []
+    for tick in range(ticks):
+        start = time.perf_counter()
+        game.update(16)
+        for player in game.players:
+            for action in ("up", "down", "left", "right"):
+                held[player.controls[action]] = random.random() < 0.3
+        for player in game.players:
+            player.move_aim(held, SCREEN_WIDTH, SCREEN_HEIGHT)
+        if tick % 4 == 0:
+            shooter = game.player_for_key(random.choice(game.players).controls["shoot"])
+            shooter.shoot(game, sound, sound)
+            del shooter.shot_marks[:-20]  # Keep draw cost comparable across long runs
+        game.draw(backend, background, font)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings) * 1e6, max(timings) * 1e6
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    backend = SurfaceBackend(screen)
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - 50))
+    font = pygame.font.Font(None, 40)
+    for count in (2, 4, 8):
+        mean, worst = run(count, ticks, backend, background, font)
+        print(f"{count} players: {mean:8.1f} us/tick mean, {worst:8.1f} us worst ({ticks} ticks)")
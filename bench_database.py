@@ -0,0 +1,112 @@
+# Measures database throughput and lock errors with several game processes writing one file.
+# Usage: python bench_database.py [seconds per run]
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+from database import Database
+from telemetry import INSERT_SHOT
+
+PROCESS_COUNTS = (1, 2, 4, 8)
+SHOTS_PER_MATCH = 20
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS matches
+       (match_id INTEGER PRIMARY KEY AUTOINCREMENT, player1_uuid TEXT, player2_uuid TEXT,
+        player1_score INTEGER, player2_score INTEGER, match_uuid TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''',
+    '''CREATE TABLE IF NOT EXISTS shots
+       (shot_id INTEGER PRIMARY KEY AUTOINCREMENT, match_uuid TEXT, player_uuid TEXT, x REAL, y REAL,
+        hit INTEGER, target_type TEXT, base_points INTEGER, multiplier INTEGER,
+        streak_bonus INTEGER, time_left INTEGER)''',
+]
+TOP_SCORES = "SELECT player1_uuid, MAX(player1_score, player2_score) AS best FROM matches ORDER BY best DESC LIMIT 5"
+
+def end_of_match(index):
+    """The writes a cabinet makes when a match ends: its score and a batch of shots."""
+    match_uuid = str(uuid.uuid4())
+    score = ("p1", "p2", index % 50, index % 37, match_uuid)
+    shots = [(match_uuid, "p1", 1.0, 2.0, i % 2, "Target", 10, 1, 0, 30) for i in range(SHOTS_PER_MATCH)]
+    return score, shots
+
+def insert_match(conn, score, shots):
+    conn.execute("INSERT INTO matches (player1_uuid, player2_uuid, player1_score, player2_score, match_uuid) "
+                 "VALUES (?, ?, ?, ?, ?)", score)
+    conn.executemany(INSERT_SHOT, shots)
+
+def naive_worker(path, seconds, results):
+    """The old access pattern: a fresh default connection per operation, deferred transactions."""
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    index = 0
+    while time.perf_counter() < deadline:
+        score, shots = end_of_match(index)
+        start = time.perf_counter()
+        try:
+            conn = sqlite3.connect(path)
+            with conn:
+                insert_match(conn, score, shots)
+            conn.execute(TOP_SCORES).fetchall()
+            conn.close()
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            errors += 1
+        index += 1
+    results.put((latencies, errors))
+
+def pooled_worker(path, seconds, results):
+    """The Database pool: long-lived WAL connections, BEGIN IMMEDIATE and retries."""
+    db = Database(path)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    index = 0
+    while time.perf_counter() < deadline:
+        score, shots = end_of_match(index)
+        start = time.perf_counter()
+        try:
+            db.write(insert_match, score, shots)
+            db.query(TOP_SCORES)
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            errors += 1
+        index += 1
+    db.close()
+    results.put((latencies, errors))
+
+def run(worker, processes, seconds):
+    """Runs `processes` workers against a fresh file; returns ops/s, p50/p99 latency in ms and errors."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        conn = sqlite3.connect(path)
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=worker, args=(path, seconds, results)) for _ in range(processes)]
+        for process in workers:
+            process.start()
+        latencies, errors = [], 0
+        for _ in workers:
+            worker_latencies, worker_errors = results.get()
+            latencies += worker_latencies
+            errors += worker_errors
+        for process in workers:
+            process.join()
+    latencies.sort()
+    if not latencies:
+        return 0.0, 0.0, 0.0, errors
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    return len(latencies) / seconds, percentile(0.5), percentile(0.99), errors
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    print(f"each op: one match row + {SHOTS_PER_MATCH} shots in a transaction, then a leaderboard read")
+    for processes in PROCESS_COUNTS:
+        for label, worker in (("naive ", naive_worker), ("pooled", pooled_worker)):
+            ops, p50, p99, errors = run(worker, processes, seconds)
+            print(f"{processes} procs {label}: {ops:7.1f} ops/s | p50 {p50:6.2f} ms, p99 {p99:7.2f} ms | "
+                  f"locked errors {errors}")
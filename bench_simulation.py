@@ -0,0 +1,68 @@
+# Measures simulation tick stability in split mode while rendering is artificially slowed.
+# Usage: python bench_simulation.py [seconds per run]
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+from game import PLAYER_COLORS
+from render_backend import SurfaceBackend
+from simulation import SplitMatch, TICK_RATE
+from user import User
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+RENDER_DELAYS_MS = (0, 20, 50, 100)
+
+class SlowBackend(SurfaceBackend):
+    """Stands in for an expensive frame: blitting the background takes `delay_ms` extra."""
+    def __init__(self, screen, background, delay_ms):
+        super().__init__(screen)
+        self.background = background
+        self.delay_ms = delay_ms
+
+    def blit(self, image, pos):
+        if image is self.background:
+            time.sleep(self.delay_ms / 1000)  # Inside SplitMatch.draw, where a racing writer would show up
+        super().blit(image, pos)
+
+def run(seconds, delay_ms, screen, background, font):
+    """Renders a split match with `delay_ms` of extra work per frame; returns tick stats and frame count."""
+    random.seed(delay_ms)
+    backend = SlowBackend(screen, background, delay_ms)
+    controls = [{"up": 1000 + i * 5, "down": 1001 + i * 5, "left": 1002 + i * 5,
+                 "right": 1003 + i * 5, "shoot": 1004 + i * 5} for i in range(2)]
+    users = [User(f"bench-{i}", f"P{i + 1}", "") for i in range(2)]
+    match = SplitMatch(users, controls, PLAYER_COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, db_path=None)
+    match.start_timers()
+    held = {key: False for key in match.aim_keys}
+    frames = 0
+    start = time.perf_counter()
+    next_shot = start
+    while time.perf_counter() < start + seconds and match.running:
+        for key in held:
+            held[key] = random.random() < 0.3
+        match.send_keys(held)
+        if time.perf_counter() >= next_shot:  # 20 bullets last the whole run at 4 shots per second
+            match.shoot(random.randrange(2))
+            next_shot += 0.25
+        match.draw(backend, background, font)
+        pygame.display.flip()
+        frames += 1
+    stats = match.tick_stats()
+    match.close()
+    return stats, frames
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - 50))
+    font = pygame.font.Font(None, 40)
+    print(f"target tick {1000 / TICK_RATE:.2f} ms; in a single process the tick would equal the frame time")
+    for delay in RENDER_DELAYS_MS:
+        stats, frames = run(seconds, delay, screen, background, font)
+        print(f"render +{delay:3d} ms: {frames / seconds:6.1f} fps | tick mean {stats['mean_ms']:6.2f} ms, "
+              f"stdev {stats['stdev_ms']:5.2f} ms, worst {stats['max_ms']:6.2f} ms, late {stats['late']}/{stats['ticks']}")
@@ -0,0 +1,83 @@
+# Measures spectator fan-out: publisher cost per tick and how well many local subscribers keep up.
+# Usage: python bench_spectator.py [seconds] [subscriber counts ...]
+import os
+import sys
+import random
+import time
+import multiprocessing
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from bench_arena import make_game, SilentSound, SCREEN_WIDTH, SCREEN_HEIGHT
+from spectator import SpectatorPublisher, SpectatorClient, HEAD_SEQUENCE
+
+RING_NAME = 'shooter_spectator_bench'
+TICK = 1 / 60
+
+def subscribe(name, ready, stop, results):
+    """Polls the ring once per 30 FPS frame, like a lobby viewer, and reports how it kept up."""
+    client = SpectatorClient(name)
+    ready.release()
+    worst_lag = 0
+    while not stop.is_set():
+        client.poll()
+        worst_lag = max(worst_lag, int(client.ring.header[HEAD_SEQUENCE]) + 1 - (client.next_sequence or 0))
+        time.sleep(1 / 30)
+    client.poll()
+    results.put((client.frames, client.resyncs, worst_lag))
+    client.close()
+
+def run(subscribers, seconds):
+    """Returns publish timings (microseconds) and per-subscriber results."""
+    random.seed(subscribers)
+    publisher = SpectatorPublisher(RING_NAME)
+    game = make_game(8)
+    publisher.start(game)
+    publisher.publish(game)
+    ready, stop, results = multiprocessing.Semaphore(0), multiprocessing.Event(), multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=subscribe, args=(RING_NAME, ready, stop, results))
+                 for _ in range(subscribers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.acquire()
+
+    sound = SilentSound()
+    held = {}
+    timings = []
+    next_tick = time.perf_counter()
+    for tick in range(int(seconds / TICK)):
+        game.update(16)
+        for player in game.players:
+            for action in ("up", "down", "left", "right"):
+                held[player.controls[action]] = random.random() < 0.3
+            player.move_aim(held, SCREEN_WIDTH, SCREEN_HEIGHT)
+        if tick % 4 == 0:
+            random.choice(game.players).shoot(game, sound, sound)
+        start = time.perf_counter()
+        publisher.publish(game)
+        timings.append(time.perf_counter() - start)
+        next_tick += TICK
+        time.sleep(max(0, next_tick - time.perf_counter()))
+
+    stop.set()
+    received = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    publisher.close()
+    return timings, received
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    counts = [int(arg) for arg in sys.argv[2:]] or [0, 8, 32, 64]
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for count in counts:
+        timings, received = run(count, seconds)
+        mean, worst = sum(timings) / len(timings) * 1e6, max(timings) * 1e6
+        line = f"{count:3d} subscribers: publish {mean:6.1f} us mean, {worst:7.1f} us worst"
+        if received:
+            frames = min(r[0] for r in received)
+            line += (f" | fewest frames {frames}/{len(timings) + 1}, resyncs {sum(r[1] for r in received)},"
+                     f" worst lag {max(r[2] for r in received)} frames")
+        print(line)
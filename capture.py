@@ -0,0 +1,181 @@
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+import pygame
+
+CAPTURE_ENABLED = os.environ.get('SHOOTER_CAPTURE', '0') == '1'
+CAPTURE_DIR = os.environ.get('SHOOTER_CAPTURE_DIR', 'captures')
+CAPTURE_FPS = 60
+CAPTURE_RING = 32  # Frames buffered between the game and the encoder (1.92 MB each for an 800x600 32-bit display)
+
+log = logging.getLogger(__name__)
+
+def pixel_format(surface):
+    """Returns the ffmpeg raw pixel format matching a 32-bit surface's memory layout, or None."""
+    if surface.get_bytesize() != 4:
+        return None
+    red, green, blue, _ = surface.get_masks()
+    if (red, green, blue) == (0xff0000, 0xff00, 0xff):
+        return 'bgr0'  # Little-endian ARGB/XRGB
+    if (red, green, blue) == (0xff, 0xff00, 0xff0000):
+        return 'rgb0'
+    return None
+
+def encoder_command(path, size, row_pixels, pix_fmt, fps):
+    """ffmpeg reading raw frames from stdin; rows padded to the surface pitch are cropped off."""
+    width, height = size
+    return [
+        'ffmpeg', '-loglevel', 'error', '-n',  # Never overwrite an earlier recording
+        '-f', 'rawvideo', '-pix_fmt', pix_fmt, '-s', f'{row_pixels}x{height}', '-r', str(fps), '-i', '-',
+        '-vf', f'crop={width}:{height}:0:0', '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+        path
+    ]
+
+class FrameCapture:
+    """Records the display surface to video without stalling the game loop.
+
+    grab() copies the frame's pixels through the buffer protocol into a
+    preallocated ring slot; a writer thread feeds the slots to an encoder
+    process. If the encoder falls behind and the ring is full, the capture
+    frame is dropped rather than the game waiting.
+
+    The encoder reads a constant frame rate, so each grabbed frame is written
+    as many times as video frames have fallen due since the previous one. The
+    video keeps wall-clock time through idle-rate stretches and dropped frames.
+    """
+    def __init__(self, surface, path, fps=CAPTURE_FPS, ring_frames=CAPTURE_RING, command=None):
+        pix_fmt = pixel_format(surface)
+        if pix_fmt is None:
+            raise ValueError("capture needs a 32-bit display surface")
+        self.frame_bytes = surface.get_pitch() * surface.get_height()
+        self.ring = np.empty((ring_frames, self.frame_bytes), np.uint8)
+        self.ring_frames = ring_frames
+        self.repeats = [0] * ring_frames  # Video frames each slot stands for
+        self.fps = fps
+        self.frames_due = 0  # Video frames assigned to grabbed frames so far
+        self.head = 0  # Next slot the game writes
+        self.tail = 0  # Next slot the writer sends
+        self.ready = threading.Condition()
+        self.captured = self.written = self.dropped = 0
+        self.started = time.perf_counter()
+        self.stopped = None
+        if command is None:
+            row_pixels = surface.get_pitch() // surface.get_bytesize()
+            command = encoder_command(path, surface.get_size(), row_pixels, pix_fmt, fps)
+        self.encoder = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.closing = False
+        self.writer = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+        self.writer.start()
+
+    def grab(self, surface):
+        """Copies the current frame into the ring; call right after presenting it."""
+        due = int((time.perf_counter() - self.started) * self.fps) + 1
+        if due <= self.frames_due:
+            return False  # The game runs faster than the video; this frame has no slot in time
+        if self.head - self.tail >= self.ring_frames:
+            self.dropped += 1  # Encoder is behind: the next grabbed frame covers this one's time
+            return False
+        pixels = np.frombuffer(surface.get_buffer(), np.uint8)
+        np.copyto(self.ring[self.head % self.ring_frames], pixels)
+        del pixels  # Unlocks the surface
+        self.repeats[self.head % self.ring_frames] = due - self.frames_due
+        self.frames_due = due
+        with self.ready:
+            self.head += 1
+            self.captured += 1
+            self.ready.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.ready:
+                while self.tail == self.head and not self.closing:
+                    self.ready.wait()
+                if self.tail == self.head:
+                    break
+                slot = self.ring[self.tail % self.ring_frames]
+                repeats = self.repeats[self.tail % self.ring_frames]
+            try:
+                for _ in range(repeats):
+                    self.encoder.stdin.write(memoryview(slot))  # The GIL is released while the pipe blocks
+            except (BrokenPipeError, OSError):
+                break
+            with self.ready:
+                self.tail += 1
+                self.written += repeats
+
+    def close(self):
+        """Sends the buffered frames, waits for the encoder and returns the report."""
+        with self.ready:
+            self.closing = True
+            self.ready.notify()
+        self.writer.join()
+        self.stopped = time.perf_counter()
+        try:
+            self.encoder.stdin.close()
+        except OSError:
+            pass
+        self.encoder.wait()
+        report = self.report()
+        log.info(report)
+        return report
+
+    def stats(self):
+        """Frames captured, video frames written and frames dropped, with throughput so far."""
+        elapsed = max(1e-9, (self.stopped or time.perf_counter()) - self.started)
+        return {
+            'captured': self.captured, 'written': self.written, 'dropped': self.dropped,
+            'fps': self.written / elapsed, 'mb_per_s': self.written * self.frame_bytes / elapsed / 1e6
+        }
+
+    def report(self):
+        stats = self.stats()
+        return (f"capture: {stats['written']} frames written at {stats['fps']:.1f} fps "
+                f"({stats['mb_per_s']:.1f} MB/s), {stats['dropped']} dropped")
+
+def capture_path(directory, name):
+    """A new file for this recording; a resumed match keeps its match id, so a time and counter are added."""
+    stem = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}"
+    path = os.path.join(directory, f"{stem}.mp4")
+    counter = 1
+    while os.path.exists(path):
+        counter += 1
+        path = os.path.join(directory, f"{stem}-{counter}.mp4")
+    return path
+
+def start_capture(surface, name, directory=CAPTURE_DIR):
+    """Starts recording to a new file in directory, or returns None if recording is not possible here."""
+    if shutil.which('ffmpeg') is None:
+        log.warning("Capture disabled: ffmpeg not found")
+        return None
+    os.makedirs(directory, exist_ok=True)
+    try:
+        return FrameCapture(surface, capture_path(directory, name))
+    except ValueError as e:
+        log.warning(f"Capture disabled: {e}")
+        return None
+
+if __name__ == "__main__":
+    # Usage: python capture.py [seconds] - records a moving test pattern and prints the report
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    capture = start_capture(screen, "selftest")
+    if capture is None:
+        sys.exit(1)
+    clock = pygame.time.Clock()
+    start = time.perf_counter()
+    frame = 0
+    while time.perf_counter() - start < seconds:
+        screen.fill((30, 30, 30))
+        pygame.draw.circle(screen, (255, 0, 0), (frame * 5 % 800, 300), 40)
+        pygame.display.flip()
+        capture.grab(screen)
+        frame += 1
+        clock.tick(CAPTURE_FPS)
+    print(capture.close())
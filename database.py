@@ -0,0 +1,114 @@
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DB_PATH = os.environ.get('SHOOTER_DB', 'users.db')  # May live on a volume shared by several cabinets
+POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 2000  # SQLite's own wait for a lock before reporting "database is locked"
+RETRIES = 6  # Attempts after a lock error, with exponential backoff on top of the busy timeout
+BACKOFF_SECONDS = 0.02
+CACHED_STATEMENTS = 256  # Prepared statements kept per connection, keyed by SQL text
+
+def connect(path=DB_PATH):
+    """Opens a connection tuned for several processes sharing one database file.
+
+    Autocommit mode (isolation_level=None) leaves transactions to transaction(),
+    which takes the write lock up front instead of upgrading a read lock later.
+    """
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+                           check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")  # Readers never block the writer, or the other way round
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+def is_locked(error):
+    """Whether an OperationalError is lock contention worth retrying."""
+    message = str(error)
+    return 'locked' in message or 'busy' in message
+
+def with_retry(operation, retries=RETRIES):
+    """Calls operation(), retrying with jittered exponential backoff while the database is locked."""
+    for attempt in range(retries + 1):
+        try:
+            return operation()
+        except sqlite3.OperationalError as e:
+            if not is_locked(e) or attempt == retries:
+                raise
+            time.sleep(BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5))
+
+def transaction(conn, work, *args):
+    """Runs work(conn, *args) in one BEGIN IMMEDIATE transaction and returns its result."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        result = work(conn, *args)
+        if conn.in_transaction:  # work may already have committed (e.g. the ensure_* helpers)
+            conn.execute("COMMIT")
+        return result
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+class Database:
+    """A small pool of long-lived connections, so prepared statements stay cached between calls.
+
+    Writes run as short BEGIN IMMEDIATE transactions that are retried as a whole
+    if another process holds the lock; keep slow work (JSON, rendering) outside them.
+    """
+    def __init__(self, path=DB_PATH, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection from the pool."""
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                can_open = self.opened < self.size
+                if can_open:
+                    self.opened += 1
+            conn = connect(self.path) if can_open else self.idle.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.idle.put(conn)
+
+    def write(self, work, *args):
+        """Runs work(conn, *args) in a short write transaction, retrying while the file is locked."""
+        with self.connection() as conn:
+            return with_retry(lambda: transaction(conn, work, *args))
+
+    def execute(self, sql, params=()):
+        """Runs a single write statement; returns the number of rows changed."""
+        return self.write(lambda conn: conn.execute(sql, params).rowcount)
+
+    def query(self, sql, params=()):
+        """Returns all rows of a read query."""
+        with self.connection() as conn:
+            return with_retry(lambda: conn.execute(sql, params).fetchall())
+
+    def query_one(self, sql, params=()):
+        """Returns the first row of a read query, or None."""
+        with self.connection() as conn:
+            return with_retry(lambda: conn.execute(sql, params).fetchone())
+
+    def close(self):
+        """Closes the idle connections."""
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+            self.opened -= 1
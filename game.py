@@ -1,100 +1,175 @@
 import pygame
 import random
+import uuid
 from game_objects import Target, TimeBonusItem, ScoreMultiplierItem, FreezeOpponentItem, ExtraBulletsItem
 from player import Player
+from spawn import SpawnPlacer, MIN_SPACING
+from render_backend import load_font
 
-def draw_text(screen, text, pos, font, color=(0, 0, 0)):
-    """Utility function to render text on the screen."""
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, pos)
+SPECIAL_ITEM_TYPES = [TimeBonusItem, ScoreMultiplierItem, FreezeOpponentItem, ExtraBulletsItem]
+TARGET_TYPES = {cls.__name__: cls for cls in [Target] + SPECIAL_ITEM_TYPES}
+PLAYER_COLORS = [
+    (255, 0, 0), (0, 0, 255), (0, 160, 0), (255, 140, 0),
+    (160, 32, 240), (0, 190, 190), (255, 20, 147), (128, 128, 0)
+]
+MAX_PLAYERS = len(PLAYER_COLORS)
 
 class Game:
     """Manages the game state, including players, targets, and game loop logic."""
-    def __init__(self, player1: Player, player2: Player, screen_width, screen_height):
-        self.player1 = player1
-        self.player2 = player2
-        self.targets = [Target(screen_width, screen_height) for _ in range(3)]
+    def __init__(self, players, screen_width, screen_height, min_spacing=MIN_SPACING):
+        self.players = list(players)
+        self.shoot_keys = {player.controls["shoot"]: player for player in self.players}
         self.running = True
         self.special_item_timer = 10000  # 10 seconds in milliseconds
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.placer = SpawnPlacer(screen_width, screen_height, min_spacing)
+        self.targets = []
+        for _ in range(3):
+            self.spawn_target()
         self.hud_height = 50  # Height of the HUD area
         self.is_new = True  # Flag to distinguish new vs. loaded games
+        self.lineage_uuid = None  # Save this game replaces when saved again
+        self.hud_font = None  # Compact font for arenas, created on first draw
+        self.match_uuid = str(uuid.uuid4())  # Links shots to the match row
+        self.shot_recorder = None  # telemetry.ShotRecorder, if shots should be kept
+        self.announcer = None  # announcer.Announcer, if pickups should be spoken
 
-    def spawn_target(self):
-        """Spawns a new regular target."""
-        self.targets.append(Target(self.screen_width, self.screen_height))
+    @property
+    def player1(self):
+        """The first seat; two-player tables (matches, saved_games) store seats 1 and 2."""
+        return self.players[0]
+
+    @property
+    def player2(self):
+        """The second seat."""
+        return self.players[1]
+
+    def player_for_key(self, key):
+        """Returns the player whose shoot key this is, or None."""
+        return self.shoot_keys.get(key)
+
+    def start_timers(self):
+        """Starts every player's clock once the countdown is over."""
+        for player in self.players:
+            player.start_timer()
+
+    def freeze_target(self, player):
+        """Picks who a freeze hits: the highest-scoring opponent of the shooter."""
+        opponents = [p for p in self.players if p is not player]
+        return max(opponents, key=lambda p: p.score) if opponents else None
+
+    def record_shot(self, player, target, base_points, multiplier, streak_bonus):
+        """Forwards a resolved shot to the shot recorder, if one is attached."""
+        if self.shot_recorder is not None:
+            self.shot_recorder.record(
+                self.match_uuid, player.uuid, player.aim_position[0], player.aim_position[1],
+                target is not None, type(target).__name__ if target else None,
+                base_points, multiplier, streak_bonus, player.time_left
+            )
+
+    def announce_pickup(self, target):
+        """Speaks a special item pickup if an announcer is attached."""
+        if self.announcer is not None:
+            self.announcer.announce_pickup(target)
+
+    def spawn_target(self, target_type=Target):
+        """Spawns a target away from other targets and the aim cursors."""
+        x, y = self.placer.place(avoid=[player.aim_position for player in self.players])
+        self.add_target(target_type(self.screen_width, self.screen_height, x, y))
+
+    def add_target(self, target):
+        """Adds a target and reserves its position."""
+        self.targets.append(target)
+        self.placer.occupy(target)
+
+    def remove_target(self, target):
+        """Removes a target and frees its position."""
+        self.targets.remove(target)
+        self.placer.release(target)
 
     def update(self, dt):
         """Updates game state based on elapsed time (dt in milliseconds)."""
-        for player in [self.player1, self.player2]:
+        still_playing = False
+        for player in self.players:
             player.update_time()
             if player.frozen:
                 player.freeze_timer -= dt
                 if player.freeze_timer <= 0:
                     player.frozen = False
-        # End game if both players are out of bullets or time
-        if (self.player1.bullets <= 0 or self.player1.time_left <= 0) and \
-           (self.player2.bullets <= 0 or self.player2.time_left <= 0):
+            if player.bullets > 0 and player.time_left > 0:
+                still_playing = True
+        # End game once every player is out of bullets or time
+        if not still_playing:
             self.running = False
         # Spawn special items periodically
         self.special_item_timer -= dt
         if self.special_item_timer <= 0:
-            special_items = [t for t in self.targets if not isinstance(t, Target)]
+            special_items = [t for t in self.targets if type(t) is not Target]
             if len(special_items) < 2:
-                item_type = random.choice([
-                    TimeBonusItem, ScoreMultiplierItem, FreezeOpponentItem, ExtraBulletsItem
-                ])
-                self.targets.append(item_type(self.screen_width, self.screen_height))
+                self.spawn_target(random.choice(SPECIAL_ITEM_TYPES))
             self.special_item_timer = 10000
 
     def draw(self, screen, background_image, font):
-        """Renders all game elements on the screen with a HUD at the top."""
-        pygame.draw.rect(screen, (50, 50, 50), (0, 0, self.screen_width, self.hud_height))
-        player1_time = max(0, self.player1.time_left // 1000)
-        player2_time = max(0, self.player2.time_left // 1000)
-        p1_text = f"{self.player1.name}: {self.player1.score} Bullets: {self.player1.bullets} Time: {player1_time}"
-        draw_text(screen, p1_text, (10, 10), font, self.player1.color)
-        p2_text = f"{self.player2.name}: {self.player2.score} Bullets: {self.player2.bullets} Time: {player2_time}"
-        p2_surface = font.render(p2_text, True, self.player2.color)
-        screen.blit(p2_surface, (self.screen_width - p2_surface.get_width() - 10, 10))
+        """Renders all game elements through a render backend with a HUD at the top."""
+        screen.fill_rect((50, 50, 50), (0, 0, self.screen_width, self.hud_height))
+        if len(self.players) <= 2:
+            player1_time = max(0, self.player1.time_left // 1000)
+            player2_time = max(0, self.player2.time_left // 1000)
+            p1_text = f"{self.player1.name}: {self.player1.score} Bullets: {self.player1.bullets} Time: {player1_time}"
+            screen.text(p1_text, (10, 10), font, self.player1.color)
+            p2_text = f"{self.player2.name}: {self.player2.score} Bullets: {self.player2.bullets} Time: {player2_time}"
+            screen.text(p2_text, (self.screen_width - 10, 10), font, self.player2.color, anchor="topright")
+        else:
+            self.draw_arena_hud(screen)
         screen.blit(background_image, (0, self.hud_height))
         for target in self.targets:
             target.draw(screen)
-        for player in [self.player1, self.player2]:
+        for player in self.players:
             for shot_mark in player.shot_marks:
                 shot_mark.draw(screen)
 
+    def draw_arena_hud(self, screen):
+        """Lays out one compact HUD cell per player in two rows."""
+        if self.hud_font is None:
+            self.hud_font = load_font(22)
+        columns = (len(self.players) + 1) // 2
+        cell_width = self.screen_width // columns
+        row_height = self.hud_height // 2
+        for i, player in enumerate(self.players):
+            x = (i % columns) * cell_width + 6
+            y = (i // columns) * row_height + 5
+            text = f"{player.name}: {player.score} B:{player.bullets} T:{max(0, player.time_left // 1000)}"
+            screen.text(text, (x, y), self.hud_font, player.color)
+
     def to_dict(self):
         """Serializes the game state to a dictionary for saving."""
         return {
-            'player1': self.player1.to_dict(),
-            'player2': self.player2.to_dict(),
+            'players': [player.to_dict() for player in self.players],
             'targets': [t.to_dict() for t in self.targets],
             'special_item_timer': self.special_item_timer,
             'running': self.running,
-            'is_new': self.is_new
+            'is_new': self.is_new,
+            'match_uuid': self.match_uuid
         }
 
     @classmethod
-    def from_dict(cls, data, player1_user, player2_user, screen_width, screen_height):
-        """Deserializes a game state from a dictionary."""
-        player1 = Player.from_dict(data['player1'], player1_user, screen_width, screen_height)
-        player2 = Player.from_dict(data['player2'], player2_user, screen_width, screen_height)
-        game = cls(player1, player2, screen_width, screen_height)
-        game.targets = []
+    def from_dict(cls, data, users, screen_width, screen_height):
+        """Deserializes a game state from a dictionary, matching saved players to users by uuid."""
+        players_data = data['players'] if 'players' in data else [data['player1'], data['player2']]
+        users_by_uuid = {user.uuid: user for user in users}
+        players = [
+            Player.from_dict(p_data, users_by_uuid.get(p_data['uuid'], user), screen_width, screen_height)
+            for p_data, user in zip(players_data, users)
+        ]
+        game = cls(players, screen_width, screen_height)
+        for target in game.targets[:]:
+            game.remove_target(target)
         for t_data in data['targets']:
-            if t_data['type'] == 'Target':
-                game.targets.append(Target.from_dict(t_data, screen_width, screen_height))
-            elif t_data['type'] == 'TimeBonusItem':
-                game.targets.append(TimeBonusItem.from_dict(t_data, screen_width, screen_height))
-            elif t_data['type'] == 'ScoreMultiplierItem':
-                game.targets.append(ScoreMultiplierItem.from_dict(t_data, screen_width, screen_height))
-            elif t_data['type'] == 'FreezeOpponentItem':
-                game.targets.append(FreezeOpponentItem.from_dict(t_data, screen_width, screen_height))
-            elif t_data['type'] == 'ExtraBulletsItem':
-                game.targets.append(ExtraBulletsItem.from_dict(t_data, screen_width, screen_height))
+            if t_data['type'] in TARGET_TYPES:
+                game.add_target(TARGET_TYPES[t_data['type']].from_dict(t_data, screen_width, screen_height))
         game.special_item_timer = data['special_item_timer']
         game.running = data['running']
         game.is_new = data.get('is_new', False)  # Default to False for loaded games
+        game.match_uuid = data.get('match_uuid', game.match_uuid)
         return game
\ No newline at end of file
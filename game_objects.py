@@ -1,6 +1,18 @@
 import pygame
 import random
 import math
+from render_backend import track_surface
+
+TARGET_SIZE = (40, 40)
+_sprites = {}  # (path, size) -> (image, mask), shared by every instance
+
+def load_sprite(path, size=TARGET_SIZE):
+    """Loads, scales and masks an image once per asset and size."""
+    key = (path, size)
+    if key not in _sprites:
+        image = track_surface(pygame.transform.scale(pygame.image.load(path).convert_alpha(), size))
+        _sprites[key] = (image, pygame.mask.from_surface(image))
+    return _sprites[key]
 
 class GameObject:
     """Base class for all game objects with position attributes."""
@@ -29,7 +41,7 @@ class ShotMark(GameObject):
 
     def draw(self, screen):
         """Draws a small circle representing the shot mark."""
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), 5)
+        screen.circle(self.color, (int(self.x), int(self.y)), 5)
 
     def to_dict(self):
         """Serializes the shot mark."""
@@ -42,16 +54,22 @@ class ShotMark(GameObject):
 
 class Target(GameObject):
     """A basic target that players can shoot for points."""
+    sprite_path = 'target.png'
+
     def __init__(self, screen_width, screen_height, x=None, y=None):
         super().__init__(
             x if x is not None else random.randint(20, screen_width - 20),
             y if y is not None else random.randint(70, screen_height - 20)
         )
-        self.image = pygame.transform.scale(
-            pygame.image.load('target.png').convert_alpha(), (40, 40)
-        )
+        self.image, self.mask = load_sprite(self.sprite_path)
         self.rect = self.image.get_rect(center=(self.x, self.y))
 
+    def hit_test(self, x, y):
+        """Pixel-accurate hit test: a bounding-box check, then one mask bit lookup."""
+        if not self.rect.collidepoint(x, y):
+            return False
+        return bool(self.mask.get_at((int(x) - self.rect.x, int(y) - self.rect.y)))
+
     def draw(self, screen):
         """Draws the target image on the screen."""
         screen.blit(self.image, self.rect)
@@ -67,12 +85,7 @@ class Target(GameObject):
 
 class TimeBonusItem(Target):
     """A special target that adds time when hit."""
-    def __init__(self, screen_width, screen_height, x=None, y=None):
-        super().__init__(screen_width, screen_height, x, y)
-        self.image = pygame.transform.scale(
-            pygame.image.load('time_bonus.png').convert_alpha(), (40, 40)
-        )
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+    sprite_path = 'time_bonus.png'
 
     def effect(self, player):
         """Adds 10 seconds to the player's extra_time."""
@@ -89,12 +102,7 @@ class TimeBonusItem(Target):
 
 class ScoreMultiplierItem(Target):
     """A special target that doubles the score of the next hit."""
-    def __init__(self, screen_width, screen_height, x=None, y=None):
-        super().__init__(screen_width, screen_height, x, y)
-        self.image = pygame.transform.scale(
-            pygame.image.load('score_multiplier.png').convert_alpha(), (40, 40)
-        )
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+    sprite_path = 'score_multiplier.png'
 
     def effect(self, player):
         """Sets the player's next hit multiplier to 2."""
@@ -110,19 +118,15 @@ class ScoreMultiplierItem(Target):
         return cls(screen_width, screen_height, data['x'], data['y'])
 
 class FreezeOpponentItem(Target):
-    """A special target that freezes the opponent for 5 seconds."""
-    def __init__(self, screen_width, screen_height, x=None, y=None):
-        super().__init__(screen_width, screen_height, x, y)
-        self.image = pygame.transform.scale(
-            pygame.image.load('freeze_opponent.png').convert_alpha(), (40, 40)
-        )
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+    """A special target that freezes the leading opponent for 5 seconds."""
+    sprite_path = 'freeze_opponent.png'
 
     def effect(self, player, game):
-        """Freezes the opponent player for 5 seconds."""
-        opponent = game.player2 if player == game.player1 else game.player1
-        opponent.frozen = True
-        opponent.freeze_timer = 5000
+        """Freezes the leading opponent for 5 seconds."""
+        opponent = game.freeze_target(player)
+        if opponent is not None:
+            opponent.frozen = True
+            opponent.freeze_timer = 5000
 
     def to_dict(self):
         """Serializes the freeze opponent item."""
@@ -135,12 +139,7 @@ class FreezeOpponentItem(Target):
 
 class ExtraBulletsItem(Target):
     """A special target that grants extra bullets."""
-    def __init__(self, screen_width, screen_height, x=None, y=None):
-        super().__init__(screen_width, screen_height, x, y)
-        self.image = pygame.transform.scale(
-            pygame.image.load('extra_bullets.png').convert_alpha(), (40, 40)
-        )
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+    sprite_path = 'extra_bullets.png'
 
     def effect(self, player):
         """Adds 5 bullets to the player's ammo."""
@@ -0,0 +1,174 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pygame
+import pytz
+from authentication import get_text_input
+from database import connect
+from render_backend import present, load_font
+
+PAGE_SIZE = 10
+FIRST_CURSOR = ('9999-12-31 23:59:59', 2 ** 63 - 1)  # Sorts after every real (timestamp, match_id)
+
+# Each arm walks its own (playerN_uuid, timestamp) index backwards from the cursor,
+# so a page costs O(PAGE_SIZE) however deep into the history it is.
+PAGE_QUERY = """
+    SELECT m.match_id, m.timestamp, u.username, m.my_score, m.their_score FROM (
+        SELECT * FROM (
+            SELECT match_id, timestamp, player2_uuid AS opponent_uuid,
+                   player1_score AS my_score, player2_score AS their_score
+            FROM matches
+            WHERE player1_uuid = :player AND (timestamp, match_id) < (:timestamp, :match_id)
+              AND (:opponent IS NULL OR player2_uuid = :opponent)
+            ORDER BY timestamp DESC, match_id DESC LIMIT :limit
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT match_id, timestamp, player1_uuid AS opponent_uuid,
+                   player2_score AS my_score, player1_score AS their_score
+            FROM matches
+            WHERE player2_uuid = :player AND (timestamp, match_id) < (:timestamp, :match_id)
+              AND (:opponent IS NULL OR player1_uuid = :opponent)
+            ORDER BY timestamp DESC, match_id DESC LIMIT :limit
+        )
+    ) m
+    LEFT JOIN users u ON u.uuid = m.opponent_uuid
+    ORDER BY m.timestamp DESC, m.match_id DESC
+    LIMIT :limit
+"""
+
+def local_timezone(name=os.environ.get('SHOOTER_TIMEZONE', 'UTC')):
+    """Returns the named timezone, or UTC if pytz does not know the name."""
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        print(f"Unknown timezone {name!r}; showing times in UTC")
+        return pytz.utc
+
+LOCAL_TIMEZONE = local_timezone()
+
+def draw_text(screen, text, pos, font, color=(0, 0, 0)):
+    """Utility function to render text on the screen."""
+    text_surface = font.render(text, True, color)
+    screen.blit(text_surface, pos)
+
+def ensure_history_indexes(conn):
+    """Creates the per-seat (player_uuid, timestamp) indexes used for keyset paging."""
+    c = conn.cursor()
+    c.execute("CREATE INDEX IF NOT EXISTS idx_matches_player1_time ON matches (player1_uuid, timestamp, match_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_matches_player2_time ON matches (player2_uuid, timestamp, match_id)")
+    conn.commit()
+
+def format_timestamp(timestamp):
+    """Converts a stored UTC timestamp to a local-time label."""
+    dt = pytz.utc.localize(datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')).astimezone(LOCAL_TIMEZONE)
+    return dt.strftime("%m/%d/%Y %I:%M %p").replace("AM", "am").replace("PM", "pm")
+
+class HistoryPage:
+    """One page of results with labels formatted once, when the page is fetched."""
+    def __init__(self, rows):
+        self.labels = []
+        for _, timestamp, opponent, my_score, their_score in rows:
+            result = "W" if my_score > their_score else "L" if my_score < their_score else "D"
+            self.labels.append(f"{format_timestamp(timestamp)}  vs {opponent or '?'}  {my_score}-{their_score} {result}")
+        self.next_cursor = (rows[-1][1], rows[-1][0]) if len(rows) == PAGE_SIZE else None
+        self.surfaces = None  # Rendered on first display
+
+    def render(self, font):
+        """Returns the label surfaces, rendering them the first time only."""
+        if self.surfaces is None:
+            self.surfaces = [font.render(label, True, (255, 255, 255)) for label in self.labels]
+        return self.surfaces
+
+class MatchHistory:
+    """Keyset-paginated match history for one player, prefetching the next page in the background."""
+    def __init__(self, db_path, player_uuid, opponent_uuid=None):
+        self.db_path = db_path
+        self.player_uuid = player_uuid
+        self.opponent_uuid = opponent_uuid
+        self.local = threading.local()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pages = [self.executor.submit(self.fetch, FIRST_CURSOR)]
+
+    def fetch(self, cursor):
+        """Runs on the worker thread, which keeps its own connection."""
+        if not hasattr(self.local, 'conn'):
+            self.local.conn = connect(self.db_path)
+        rows = self.local.conn.execute(PAGE_QUERY, {
+            'player': self.player_uuid, 'opponent': self.opponent_uuid,
+            'timestamp': cursor[0], 'match_id': cursor[1], 'limit': PAGE_SIZE
+        }).fetchall()
+        return HistoryPage(rows)
+
+    def page(self, index):
+        """Returns page `index` (waiting if needed) and starts fetching the one after it."""
+        page = self.pages[index].result()
+        if index + 1 == len(self.pages) and page.next_cursor is not None:
+            self.pages.append(self.executor.submit(self.fetch, page.next_cursor))
+        return page
+
+    def has_next(self, index):
+        """Whether a page exists after `index`."""
+        return self.pages[index].result().next_cursor is not None
+
+    def close(self):
+        """Stops the prefetch worker and closes its connection."""
+        for page in self.pages:
+            page.cancel()
+        self.executor.submit(self.close_connection)
+        self.executor.shutdown(wait=False)
+
+    def close_connection(self):
+        """Runs on the worker thread, which owns the connection."""
+        if hasattr(self.local, 'conn'):
+            self.local.conn.close()
+            del self.local.conn
+
+def history_screen(screen, db, background_image, user):
+    """Browses a player's full match history; Left/Right page, F filters by opponent, Esc returns."""
+    font = load_font(28)
+    clock = pygame.time.Clock()
+    db_path = db.path  # The prefetch worker opens its own connection
+    opponent_name = None
+    history = MatchHistory(db_path, user.uuid)
+    index = 0
+
+    while True:
+        page = history.page(index)
+        screen.blit(background_image, (0, 0))
+        title = f"Match history - {user.username}" + (f" vs {opponent_name}" if opponent_name else "")
+        draw_text(screen, title, (50, 30), font)
+        draw_text(screen, "Left/Right: page   F: filter opponent   Esc: back", (50, 60), font)
+        for i, surface in enumerate(page.render(font)):
+            screen.blit(surface, (50, 110 + i * 40))
+        if not page.labels:
+            draw_text(screen, "No matches found.", (50, 110), font, (255, 0, 0))
+        draw_text(screen, f"Page {index + 1}", (50, 530), font)
+        present()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    history.close()
+                    return
+                elif event.key == pygame.K_RIGHT and history.has_next(index):
+                    index += 1
+                elif event.key == pygame.K_LEFT and index > 0:
+                    index -= 1
+                elif event.key == pygame.K_f:
+                    name = get_text_input(screen, "Opponent username (empty for all):", background_image)
+                    if name is None:
+                        continue
+                    opponent_uuid = None
+                    if name:
+                        row = db.query_one("SELECT uuid FROM users WHERE username = ?", (name,))
+                        opponent_uuid = row[0] if row else ''  # Unknown names match nothing
+                    opponent_name = name or None
+                    history.close()
+                    history = MatchHistory(db_path, user.uuid, opponent_uuid)
+                    index = 0
+        clock.tick(30)
@@ -0,0 +1,96 @@
+import time
+from collections import deque
+import pygame
+
+LATENCY_WINDOW = 600  # Number of recent samples kept per kind
+DEBUG_REFRESH_FRAMES = 30  # Recompute percentiles twice a second at 60 FPS
+
+def percentile(sorted_samples, fraction):
+    """Returns the nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[index]
+
+class InputPipeline:
+    """Timestamps input as it arrives and measures how long it takes to reach the screen.
+
+    pygame does not expose SDL's event timestamps, so the frame sleep is spent
+    in wait(), which stamps each event within about a millisecond of arrival.
+    The percentiles therefore cover the wait for the next frame, the update and
+    the draw up to the flip; an event that arrives while a frame is being drawn
+    is stamped when the next sleep starts, so that part of its wait is missed.
+    """
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = {"shot": deque(maxlen=window), "aim": deque(maxlen=window)}
+        self.pending = []  # (kind, timestamp) applied to the frame being built
+        self.held = []  # (timestamp, event) taken off the queue early, e.g. by the frame pacer
+        self.debug = False
+        self.debug_lines = []
+        self.frames_since_refresh = DEBUG_REFRESH_FRAMES
+
+    def hold(self, event):
+        """Keeps an event read outside poll(); the next poll returns it ahead of the queue."""
+        self.held.append((time.perf_counter(), event))
+
+    def wait(self, seconds, until_event=False):
+        """Sleeps up to `seconds`, stamping events as they arrive; returns whether any did."""
+        deadline = time.perf_counter() + seconds
+        arrived = False
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining < 0.001:  # event.wait(0) would block until the next event
+                if remaining > 0:
+                    time.sleep(remaining)
+                return arrived
+            event = pygame.event.wait(int(remaining * 1000))
+            if event.type != pygame.NOEVENT:
+                self.hold(event)
+                arrived = True
+                if until_event:
+                    return True
+
+    def poll(self):
+        """Returns the events stamped by wait(), then drains the queue, stamping the rest now."""
+        now = time.perf_counter()
+        events = self.held + [(now, event) for event in pygame.event.get()]
+        self.held = []
+        return events
+
+    def sample_keys(self):
+        """Reads the keyboard state and returns it with its timestamp."""
+        return time.perf_counter(), pygame.key.get_pressed()
+
+    def mark(self, kind, timestamp):
+        """Records that input read at timestamp changed the frame being built."""
+        self.pending.append((kind, timestamp))
+
+    def presented(self):
+        """Closes every pending sample; call right after the display flip."""
+        now = time.perf_counter()
+        for kind, timestamp in self.pending:
+            self.samples[kind].append((now - timestamp) * 1000.0)
+        self.pending.clear()
+
+    def percentiles(self, kind):
+        """Returns the p50, p95 and p99 latency in milliseconds for a kind."""
+        ordered = sorted(self.samples[kind])
+        return percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99)
+
+    def draw_debug(self, screen, font, pos):
+        """Draws the latency percentiles when the debug view is enabled."""
+        if not self.debug:
+            return
+        self.frames_since_refresh += 1
+        if self.frames_since_refresh >= DEBUG_REFRESH_FRAMES:
+            self.frames_since_refresh = 0
+            self.debug_lines = []
+            for kind, samples in self.samples.items():
+                p50, p95, p99 = self.percentiles(kind)
+                self.debug_lines.append(
+                    f"{kind} n={len(samples)} p50={p50:.1f} p95={p95:.1f} p99={p99:.1f} ms"
+                )
+        x, y = pos
+        for line in self.debug_lines:
+            screen.text(line, (x, y), font, (255, 255, 0))
+            y += font.get_linesize()
@@ -1,37 +1,78 @@
 import pygame
 from datetime import datetime
+from render_backend import present, load_font
+from analytics import ShotAnalytics
+
+HEATMAP_RECT = pygame.Rect(300, 340, 440, 220)
+UPDATE_ROWS = 20000  # Shots aggregated per frame while the leaderboard is open
+TOP_MATCHES_QUERY = """
+    SELECT u1.username, u2.username, m.player1_score, m.player2_score, m.timestamp
+    FROM matches m
+    JOIN users u1 ON m.player1_uuid = u1.uuid
+    JOIN users u2 ON m.player2_uuid = u2.uuid
+    ORDER BY MAX(m.player1_score, m.player2_score) DESC
+    LIMIT 5
+"""
+_analytics = None  # Shared across visits so only new shots are aggregated
 
 def draw_text(screen, text, pos, font, color=(0, 0, 0)):
     """Utility function to render text on the screen."""
     text_surface = font.render(text, True, color)
     screen.blit(text_surface, pos)
 
-def leaderboard_screen(screen, conn, background_image):
+def shot_analytics(screen):
+    """Returns the shared analytics, creating it for this screen size on first use."""
+    global _analytics
+    if _analytics is None:
+        width, height = screen.get_size()
+        _analytics = ShotAnalytics(width, height)
+    return _analytics
+
+def draw_shot_analytics(screen, db, analytics, pending):
+    """Draws the all-time shot heatmap and accuracy of the busiest shooters."""
+    pygame.draw.rect(screen, (0, 0, 0), HEATMAP_RECT)
+    screen.blit(analytics.heatmap_surface(HEATMAP_RECT.size), HEATMAP_RECT)
+    font = load_font(24)
+    if pending:
+        draw_text(screen, "Reading new shots...", (HEATMAP_RECT.x, HEATMAP_RECT.bottom + 8), font)
+
+    top = analytics.top_players()
+    if not top:
+        return
+    names = dict(db.query(f"SELECT uuid, username FROM users WHERE uuid IN ({','.join('?' * len(top))})", top))
+    draw_text(screen, "Accuracy / typical gap", (20, 340), font)
+    for i, uuid in enumerate(top):
+        stats = analytics.player_stats(uuid)
+        gap = f"{stats['median_distance']:.0f}px" if stats['median_distance'] is not None else "-"
+        text = f"{names.get(uuid, '?')}: {stats['accuracy']:.0%} ({stats['shots']} shots), {gap}"
+        draw_text(screen, text, (20, 370 + i * 28), font)
+
+def leaderboard_screen(screen, db, background_image):
     """Displays the top 5 matches by highest score."""
-    c = conn.cursor()
-    c.execute("""
-        SELECT u1.username, u2.username, m.player1_score, m.player2_score, m.timestamp
-        FROM matches m
-        JOIN users u1 ON m.player1_uuid = u1.uuid
-        JOIN users u2 ON m.player2_uuid = u2.uuid
-        ORDER BY MAX(m.player1_score, m.player2_score) DESC
-        LIMIT 5
-    """)
-    matches = c.fetchall()
-    font = pygame.font.Font(None, 32)
-    screen.blit(background_image, (0, 0))
-    draw_text(screen, "Leaderboard - Top 5 Matches", (300, 50), font)
-    for i, (p1, p2, p1_score, p2_score, timestamp) in enumerate(matches):
-        dt = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
-        time_str = dt.strftime("%m/%d/%Y %I:%M %p").replace("AM", "am").replace("PM", "pm")
-        text = f"{p1}: {p1_score} vs {p2}: {p2_score} ({time_str})"
-        draw_text(screen, text, (300, 100 + i * 40), font)
-    draw_text(screen, "Press any key to return.", (300, 300), font)
-    pygame.display.flip()
+    matches = db.query(TOP_MATCHES_QUERY)
+    font = load_font(32)
+    analytics = shot_analytics(screen)
+    clock = pygame.time.Clock()
+    pending = True
     while True:
+        if pending:
+            # New shots are folded in a bounded slice per frame so the screen stays responsive
+            with db.connection() as conn:
+                pending = analytics.update(conn, max_rows=UPDATE_ROWS) == UPDATE_ROWS
+            screen.blit(background_image, (0, 0))
+            draw_text(screen, "Leaderboard - Top 5 Matches", (300, 50), font)
+            for i, (p1, p2, p1_score, p2_score, timestamp) in enumerate(matches):
+                dt = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+                time_str = dt.strftime("%m/%d/%Y %I:%M %p").replace("AM", "am").replace("PM", "pm")
+                text = f"{p1}: {p1_score} vs {p2}: {p2_score} ({time_str})"
+                draw_text(screen, text, (300, 100 + i * 40), font)
+            draw_text(screen, "Press any key to return.", (300, 300), font)
+            draw_shot_analytics(screen, db, analytics, pending)
+            present()
         for event in pygame.event.get():
             if event.type == pygame.KEYDOWN:
                 return
             if event.type == pygame.QUIT:
                 pygame.quit()
-                exit()
\ No newline at end of file
+                exit()
+        clock.tick(30)
\ No newline at end of file
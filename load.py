@@ -1,48 +1,92 @@
+import os
 import pygame
-import sqlite3
 import json
+import uuid
 from game import Game
 from datetime import datetime
+from render_backend import present, load_font
+
+SAVE_RETENTION = int(os.environ.get('SHOOTER_SAVE_RETENTION', 5))  # Saves kept per player pair
 
 def draw_text(screen, text, pos, font, color=(0, 0, 0)):
     """Utility function to render text on the screen."""
     text_surface = font.render(text, True, color)
     screen.blit(text_surface, pos)
 
-def load_saved_game(screen, conn, player1_user, player2_user, screen_width, screen_height):
-    """Loads a saved game for the two specified players."""
+def ensure_saved_games_schema(conn):
+    """Adds the lineage column and pair index to older saved_games tables."""
+    c = conn.cursor()
+    columns = [row[1] for row in c.execute("PRAGMA table_info(saved_games)")]
+    if 'lineage_uuid' not in columns:
+        c.execute("ALTER TABLE saved_games ADD COLUMN lineage_uuid TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_saved_games_lineage ON saved_games (lineage_uuid)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_saved_games_pair ON saved_games (player1_uuid, player2_uuid, timestamp)")
+    conn.commit()
+
+def save_game_state(game, db, keep=SAVE_RETENTION):
+    """Saves the game, replacing the save it was resumed from and pruning old saves of the pair."""
+    game_uuid = str(uuid.uuid4())
+    lineage_uuid = game.lineage_uuid or game_uuid
+    game_state = json.dumps(game.to_dict())  # Serialized before taking the write lock
+
+    def replace_save(conn):
+        c = conn.cursor()
+        c.execute("DELETE FROM saved_games WHERE lineage_uuid = ? OR game_uuid = ?",
+                  (lineage_uuid, lineage_uuid))
+        c.execute("INSERT INTO saved_games (game_uuid, player1_uuid, player2_uuid, game_state, lineage_uuid) "
+                  "VALUES (?, ?, ?, ?, ?)",
+                  (game_uuid, game.player1.uuid, game.player2.uuid, game_state, lineage_uuid))
+        prune_saved_games(conn, game.player1.uuid, game.player2.uuid, keep)
+
+    db.write(replace_save)
+    game.lineage_uuid = lineage_uuid
+    print(f"Game saved with ID: {game_uuid}")
+
+def prune_saved_games(conn, player1_uuid, player2_uuid, keep=SAVE_RETENTION):
+    """Deletes all but the newest `keep` saves of a player pair, in either seat order."""
     c = conn.cursor()
     c.execute("""
-        SELECT game_uuid, game_state, timestamp
+        DELETE FROM saved_games WHERE game_uuid IN (
+            SELECT game_uuid FROM saved_games
+            WHERE (player1_uuid = ? AND player2_uuid = ?) OR (player1_uuid = ? AND player2_uuid = ?)
+            ORDER BY timestamp DESC, rowid DESC
+            LIMIT -1 OFFSET ?
+        )
+    """, (player1_uuid, player2_uuid, player2_uuid, player1_uuid, keep))
+    return c.rowcount
+
+def load_saved_game(screen, db, player1_user, player2_user, screen_width, screen_height, background_image):
+    """Loads a saved game for the two specified players."""
+    # The list only needs ids and times; the game_state blob is read for the chosen save only
+    saved_games = db.query("""
+        SELECT game_uuid, timestamp, lineage_uuid
         FROM saved_games
         WHERE (player1_uuid = ? AND player2_uuid = ?) OR (player1_uuid = ? AND player2_uuid = ?)
         ORDER BY timestamp DESC
     """, (player1_user.uuid, player2_user.uuid, player2_user.uuid, player1_user.uuid))
-    saved_games = c.fetchall()
 
     if not saved_games:
-        font = pygame.font.Font(None, 32)
-        screen.blit(pygame.transform.scale(pygame.image.load('background.jpg').convert(), (screen_width, screen_height)), (0, 0))
+        font = load_font(32)
+        screen.blit(background_image, (0, 0))
         draw_text(screen, "No saved games found.", (300, 300), font, (255, 0, 0))
-        pygame.display.flip()
+        present()
         pygame.time.wait(2000)
         return None
 
-    font = pygame.font.Font(None, 32)
+    font = load_font(32)
     selected = 0
     clock = pygame.time.Clock()
-    background = pygame.transform.scale(pygame.image.load('background.jpg').convert(), (screen_width, screen_height))
 
     while True:
-        screen.blit(background, (0, 0))
+        screen.blit(background_image, (0, 0))
         draw_text(screen, "Select a saved game (Up/Down, Enter to load, Esc to back)", (150, 50), font)
-        for i, (game_uuid, game_state, timestamp) in enumerate(saved_games):
+        for i, (game_uuid, timestamp, _) in enumerate(saved_games):
             dt = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
             time_str = dt.strftime("%m/%d/%Y %I:%M %p").replace("AM", "am").replace("PM", "pm")
             text = f"Game {i + 1}: {time_str} (ID: {game_uuid})"
             color = (255, 255, 0) if i == selected else (255, 255, 255)
             draw_text(screen, text, (150, 100 + i * 40), font, color)
-        pygame.display.flip()
+        present()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -54,8 +98,11 @@ def load_saved_game(screen, conn, player1_user, player2_user, screen_width, scre
                 elif event.key == pygame.K_DOWN and selected < len(saved_games) - 1:
                     selected += 1
                 elif event.key == pygame.K_RETURN:
-                    game_data = json.loads(saved_games[selected][1])
-                    return Game.from_dict(game_data, player1_user, player2_user, screen_width, screen_height)
+                    game_uuid, _, lineage_uuid = saved_games[selected]
+                    game_state = db.query_one("SELECT game_state FROM saved_games WHERE game_uuid = ?", (game_uuid,))[0]
+                    game = Game.from_dict(json.loads(game_state), [player1_user, player2_user], screen_width, screen_height)
+                    game.lineage_uuid = lineage_uuid or game_uuid  # Resaving replaces this save
+                    return game
                 elif event.key == pygame.K_ESCAPE:
                     return None  # Back to menu
         clock.tick(30)
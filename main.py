@@ -1,40 +1,56 @@
+import logging
 import pygame
-import sqlite3
-import json
-import uuid
-from authentication import authenticate_players
+from authentication import authenticate_players, login_screen
 from settings import settings_screen
 from leaderboard import leaderboard_screen
-from game import Game
+from game import Game, PLAYER_COLORS, MAX_PLAYERS
 from player import Player
 from user import User
-from load import load_saved_game
+from load import load_saved_game, save_game_state, ensure_saved_games_schema
+from audio import AudioManager, pre_init
+from input_pipeline import InputPipeline
+from render_backend import create_backend, present, SurfaceBackend, load_font, track_surface
+from telemetry import ShotRecorder, ensure_shots_schema
+from history import history_screen, ensure_history_indexes
+from simulation import SplitMatch, SPLIT_SIMULATION
+from pacing import FramePacer
+from announcer import Announcer, ANNOUNCER_GROUP
+from spectator import SpectatorPublisher, SPECTATOR_ENABLED
+from capture import start_capture, CAPTURE_ENABLED
+from memory_budget import MemoryTracker
+from database import Database, DB_PATH
 
-# Initialize Pygame
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+# Initialize Pygame with a low-latency mixer buffer
+pre_init()
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+# SHOOTER_RENDERER=texture selects the SDL2 Renderer backend; menus always draw into `screen`
+backend = create_backend((SCREEN_WIDTH, SCREEN_HEIGHT), "Shooter", pygame.image.load('icon.png'))
+screen = backend.screen
 clock = pygame.time.Clock()
-pygame.display.set_caption("Shooter")
-pygame.display.set_icon(pygame.image.load('icon.png'))
 
-# Load assets
-shoot_sound = pygame.mixer.Sound('shoot.wav')
-hit_sound = pygame.mixer.Sound('hit.wav')
-auth_background = pygame.transform.scale(
+# Load assets; each seat gets reserved channels so rapid fire can't steal another player's sounds
+seat_groups = [f"player{i + 1}" for i in range(MAX_PLAYERS)]
+audio = AudioManager(seat_groups + [ANNOUNCER_GROUP])
+audio.load("shoot", 'shoot.wav')
+audio.load("hit", 'hit.wav')
+seat_sounds = [(audio.voice("shoot", group), audio.voice("hit", group)) for group in seat_groups]
+announcer = Announcer(audio)  # Synthesizes the fixed phrases in the background from startup
+auth_background = track_surface(pygame.transform.scale(
     pygame.image.load('background.jpg').convert(), (SCREEN_WIDTH, SCREEN_HEIGHT)
-)
-game_background = pygame.transform.scale(
+))
+game_background = track_surface(pygame.transform.scale(
     pygame.image.load('game_background.jpg').convert(), (SCREEN_WIDTH, SCREEN_HEIGHT - 50)
-)
+))
 
 # Play background music at startup
 pygame.mixer.music.load('background_music.mp3')
 sound_volume = 1.0  # Initial volume
 pygame.mixer.music.set_volume(sound_volume)
 pygame.mixer.music.play(-1)  # Loop indefinitely
-shoot_sound.set_volume(sound_volume)
-hit_sound.set_volume(sound_volume)
+audio.set_volume(sound_volume)
 
 # Initial control schemes
 control_schemes = {
@@ -43,53 +59,124 @@ control_schemes = {
 }
 player1_controls = control_schemes["scheme1"]
 player2_controls = control_schemes["scheme2"]
+# Extra seats for arena matches; seats 1 and 2 always use the configurable controls above
+arena_control_schemes = [
+    {"up": pygame.K_i, "down": pygame.K_k, "left": pygame.K_j, "right": pygame.K_l, "shoot": pygame.K_u},
+    {"up": pygame.K_KP8, "down": pygame.K_KP5, "left": pygame.K_KP4, "right": pygame.K_KP6, "shoot": pygame.K_KP0},
+    {"up": pygame.K_t, "down": pygame.K_g, "left": pygame.K_f, "right": pygame.K_h, "shoot": pygame.K_r},
+    {"up": pygame.K_HOME, "down": pygame.K_END, "left": pygame.K_DELETE, "right": pygame.K_PAGEDOWN, "shoot": pygame.K_INSERT},
+    {"up": pygame.K_o, "down": pygame.K_PERIOD, "left": pygame.K_COMMA, "right": pygame.K_SLASH, "shoot": pygame.K_p},
+    {"up": pygame.K_1, "down": pygame.K_2, "left": pygame.K_3, "right": pygame.K_4, "shoot": pygame.K_5}
+]
+input_pipeline = InputPipeline()  # F3 toggles the latency debug view during matches
 
-# Database setup
-conn = sqlite3.connect('users.db')
-c = conn.cursor()
-c.execute('''CREATE TABLE IF NOT EXISTS users
-             (uuid TEXT PRIMARY KEY, username TEXT UNIQUE, password TEXT)''')
-c.execute('''CREATE TABLE IF NOT EXISTS matches
-             (match_id INTEGER PRIMARY KEY AUTOINCREMENT,
-              player1_uuid TEXT, player2_uuid TEXT, player1_score INTEGER,
-              player2_score INTEGER, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-c.execute('''CREATE TABLE IF NOT EXISTS saved_games
-             (game_uuid TEXT PRIMARY KEY,
-              player1_uuid TEXT, player2_uuid TEXT, game_state TEXT,
-              timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-conn.commit()
-
-def save_scores(player1, player2, conn):
-    """Saves the match scores to the database."""
+# Database setup; SHOOTER_DB may point several cabinets at one shared file
+def create_schema(conn):
+    """Creates the tables and indexes, migrating older databases."""
     c = conn.cursor()
-    c.execute("INSERT INTO matches (player1_uuid, player2_uuid, player1_score, player2_score) VALUES (?, ?, ?, ?)",
-              (player1.uuid, player2.uuid, player1.score, player2.score))
-    conn.commit()
-
-def save_game_state(game, conn):
-    """Saves the current game state to the database."""
-    game_uuid = str(uuid.uuid4())
-    game_state = json.dumps(game.to_dict())
-    c = conn.cursor()
-    c.execute("INSERT INTO saved_games (game_uuid, player1_uuid, player2_uuid, game_state) VALUES (?, ?, ?, ?)",
-              (game_uuid, game.player1.uuid, game.player2.uuid, game_state))
-    conn.commit()
-    print(f"Game saved with ID: {game_uuid}")
+    c.execute('''CREATE TABLE IF NOT EXISTS users
+                 (uuid TEXT PRIMARY KEY, username TEXT UNIQUE, password TEXT)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS matches
+                 (match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  player1_uuid TEXT, player2_uuid TEXT, player1_score INTEGER,
+                  player2_score INTEGER, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS saved_games
+                 (game_uuid TEXT PRIMARY KEY,
+                  player1_uuid TEXT, player2_uuid TEXT, game_state TEXT,
+                  timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    ensure_saved_games_schema(conn)
+    ensure_shots_schema(conn)
+    ensure_history_indexes(conn)
+
+db = Database(DB_PATH)
+db.write(create_schema)
+shot_recorder = ShotRecorder(DB_PATH)
+# SHOOTER_MEMORY=1 snapshots memory at every scene change and checks it against budgets
+memory = MemoryTracker()
+# SHOOTER_SPECTATOR=1 streams matches to `python spectator.py` viewers on this machine
+spectators = SpectatorPublisher() if SPECTATOR_ENABLED else None
+
+def save_scores(player1, player2, db, match_uuid=None):
+    """Saves the match scores to the database."""
+    db.execute("INSERT INTO matches (player1_uuid, player2_uuid, player1_score, player2_score, match_uuid) VALUES (?, ?, ?, ?, ?)",
+               (player1.uuid, player2.uuid, player1.score, player2.score, match_uuid))
+
+def new_game(users):
+    """Creates a fresh game with one seat per user."""
+    controls = [player1_controls, player2_controls] + arena_control_schemes
+    if SPLIT_SIMULATION:
+        return SplitMatch(users, controls, PLAYER_COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, db_path=DB_PATH)
+    players = [
+        Player(user, controls[i], PLAYER_COLORS[i], SCREEN_WIDTH, SCREEN_HEIGHT)
+        for i, user in enumerate(users)
+    ]
+    return Game(players, SCREEN_WIDTH, SCREEN_HEIGHT)
 
 def draw_text(screen, text, pos, font, color=(0, 0, 0)):
     """Utility function to render text on the screen."""
     text_surface = font.render(text, True, color)
     screen.blit(text_surface, pos)
 
+def draw_pause_menu(font, pause_menu_font, resume_rect, quit_rect, quit_label):
+    """Draws the pause overlay over the current frame."""
+    backend.fill_rect((0, 0, 0, 128), (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+    backend.text("Paused", (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 100), pause_menu_font, (255, 255, 255))
+    backend.fill_rect((0, 255, 0), resume_rect)
+    backend.text("Resume", (resume_rect.x + 50, resume_rect.y + 15), font, (255, 255, 255))
+    backend.fill_rect((255, 0, 0), quit_rect)
+    backend.text(quit_label, (quit_rect.x + 20, quit_rect.y + 15), font, (255, 255, 255))
+
+def play_split_match(game, font, pause_menu_font, resume_rect, quit_rect):
+    """Renders a SplitMatch: input is sent to the simulation process and state is read from shared memory."""
+    paused = False
+    debug_font = load_font(24)
+    pacer = FramePacer(clock, input_pipeline, adaptive=False)  # The simulation keeps its own tick
+    while game.running:
+        pacer.tick()
+        for stamp, event in input_pipeline.poll():
+            if event.type == pygame.QUIT:
+                game.stop()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    input_pipeline.debug = not input_pipeline.debug
+                elif event.key == pygame.K_ESCAPE:
+                    paused = not paused
+                    game.pause(paused)
+                elif not paused:
+                    seat = game.player_for_key(event.key)
+                    if seat is not None:
+                        game.shoot(seat)
+                        input_pipeline.mark("shot", stamp)
+            elif event.type == pygame.MOUSEBUTTONDOWN and paused:
+                if resume_rect.collidepoint(event.pos):
+                    paused = False
+                    game.pause(False)
+                elif quit_rect.collidepoint(event.pos):
+                    game.stop()
+
+        if not paused:
+            stamp, keys = input_pipeline.sample_keys()
+            game.send_keys(keys)
+        game.play_sounds(seat_sounds)
+        game.draw(backend, game_background, font)
+        if paused:
+            draw_pause_menu(font, pause_menu_font, resume_rect, quit_rect, "Quit")
+        input_pipeline.draw_debug(backend, debug_font, (10, SCREEN_HEIGHT - 50))
+        backend.present()
+        input_pipeline.presented()
+    game.close()
+
 def initial_menu(screen, background_image):
     """Displays the initial menu with options."""
-    font = pygame.font.Font(None, 32)
+    font = load_font(32)
     options = [
         ("New Game", pygame.Rect(100, 100, 150, 50), (0, 255, 0), "start_new_game"),
         ("Load Game", pygame.Rect(100, 160, 150, 50), (0, 0, 255), "load_game"),
-        ("Leaderboard", pygame.Rect(100, 220, 150, 50), (255, 165, 0), "leaderboard"),
-        ("Settings", pygame.Rect(100, 280, 150, 50), (128, 128, 128), "settings"),
-        ("Quit", pygame.Rect(100, 340, 150, 50), (255, 0, 0), "quit")
+        ("Arena", pygame.Rect(100, 220, 150, 50), (160, 32, 240), "arena"),
+        ("Leaderboard", pygame.Rect(100, 280, 150, 50), (255, 165, 0), "leaderboard"),
+        ("History", pygame.Rect(100, 340, 150, 50), (0, 191, 255), "history"),
+        ("Settings", pygame.Rect(100, 400, 150, 50), (128, 128, 128), "settings"),
+        ("Quit", pygame.Rect(100, 460, 150, 50), (255, 0, 0), "quit")
     ]
 
     while True:
@@ -98,7 +185,7 @@ def initial_menu(screen, background_image):
         for text, rect, color, value in options:
             pygame.draw.rect(screen, color, rect)
             draw_text(screen, text, (rect.x + 10, rect.y + 15), font)
-        pygame.display.flip()
+        present()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -113,29 +200,63 @@ def initial_menu(screen, background_image):
                         return value
         clock.tick(30)
 
+def arena_menu(screen, background_image):
+    """Lets the players pick an arena size; returns the player count or None for back."""
+    font = load_font(32)
+    options = [(str(n), pygame.Rect(100 + (n - 3) * 70, 160, 60, 50), n) for n in range(3, MAX_PLAYERS + 1)]
+    back_rect = pygame.Rect(100, 230, 100, 50)
+
+    while True:
+        screen.blit(background_image, (0, 0))
+        draw_text(screen, "Arena - number of players", (100, 100), font)
+        for text, rect, _ in options:
+            pygame.draw.rect(screen, (160, 32, 240), rect)
+            draw_text(screen, text, (rect.x + 22, rect.y + 15), font)
+        pygame.draw.rect(screen, (255, 0, 0), back_rect)
+        draw_text(screen, "Back", (back_rect.x + 20, back_rect.y + 15), font)
+        present()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if back_rect.collidepoint(event.pos):
+                    return None
+                for _, rect, count in options:
+                    if rect.collidepoint(event.pos):
+                        return count
+        clock.tick(30)
+
 def main():
     global player1_controls, player2_controls, sound_volume
     while True:
+        memory.scene("menu")
         choice = initial_menu(screen, auth_background)
-        if choice in ["start_new_game", "load_game"]:
+        if choice in ["start_new_game", "load_game", "arena"]:
+            player_count = 2
+            if choice == "arena":
+                player_count = arena_menu(screen, auth_background)
+                if not player_count:
+                    continue  # Back to main menu
             # Authenticate players with sign up, login, and back options
-            player1_user, player2_user = authenticate_players(
-                screen, conn, auth_background, settings_screen, leaderboard_screen,
+            users = authenticate_players(
+                screen, db, auth_background, settings_screen, leaderboard_screen,
                 control_schemes, player1_controls, player2_controls, sound_volume,
-                shoot_sound, hit_sound, allow_signup=(choice == "start_new_game")
+                audio, allow_signup=(choice != "load_game"), player_count=player_count
             )
-            if not player1_user or not player2_user:
+            if not all(users):
                 continue  # Back to main menu
+            announcer.prepare_players(users)
 
             # Pause music before entering game
             pygame.mixer.music.pause()
 
-            if choice == "start_new_game":
-                player1 = Player(player1_user, player1_controls, (255, 0, 0), SCREEN_WIDTH, SCREEN_HEIGHT)
-                player2 = Player(player2_user, player2_controls, (0, 0, 255), SCREEN_WIDTH, SCREEN_HEIGHT)
-                game = Game(player1, player2, SCREEN_WIDTH, SCREEN_HEIGHT)
+            if choice in ["start_new_game", "arena"]:
+                game = new_game(users)
             elif choice == "load_game":
-                saved_game = load_saved_game(screen, conn, player1_user, player2_user, SCREEN_WIDTH, SCREEN_HEIGHT)
+                memory.scene("load")
+                saved_game = load_saved_game(screen, db, users[0], users[1], SCREEN_WIDTH, SCREEN_HEIGHT, auth_background)
                 if saved_game:
                     game = saved_game
                 else:
@@ -143,43 +264,67 @@ def main():
                     continue  # Back to menu
 
             while True:
-                font = pygame.font.Font(None, 40)
+                font = load_font(40)
                 paused = False
                 pause_start_time = None
-                pause_menu_font = pygame.font.Font(None, 50)
+                pause_menu_font = load_font(50)
                 resume_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50, 200, 50)
                 quit_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 20, 200, 50)
+                two_player = len(game.players) == 2  # matches and saved_games only hold two seats
+                game.shot_recorder = shot_recorder
+                game.announcer = announcer
+                memory.scene("match")
 
                 # Countdown only for new games, timers start after countdown
                 if game.is_new:
                     screen.blit(game_background, (0, 50))
-                    pygame.display.flip()
-                    countdown_font = pygame.font.Font(None, 100)
+                    present()
+                    countdown_font = load_font(100)
                     for i in range(3, 0, -1):
+                        announcer.say(str(i))
                         screen.blit(game_background, (0, 50))
                         text = countdown_font.render(str(i), True, (255, 255, 255))
                         screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - text.get_height() // 2 + 25))
-                        pygame.display.flip()
+                        present()
                         pygame.time.wait(1000)
                     screen.blit(game_background, (0, 50))
+                    announcer.say("Go!")
                     text = countdown_font.render("Go!", True, (255, 255, 255))
                     screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - text.get_height() // 2 + 25))
-                    pygame.display.flip()
+                    present()
                     pygame.time.wait(1000)
-                    game.player1.start_timer()
-                    game.player2.start_timer()
+                    game.start_timers()
                     game.is_new = False  # Set to False after countdown
 
+                if isinstance(game, SplitMatch):
+                    play_split_match(game, font, pause_menu_font, resume_rect, quit_rect)
+
+                debug_font = load_font(24)
+                # SHOOTER_ADAPTIVE_FPS=1 drops to a low redraw rate while nobody aims or shoots
+                pacer = FramePacer(clock, input_pipeline)
+                if spectators and not isinstance(game, SplitMatch):
+                    spectators.start(game)
+                # SHOOTER_CAPTURE=1 records matches drawn by the surface backend to captures/<match>.mp4
+                capture = None
+                if CAPTURE_ENABLED and isinstance(backend, SurfaceBackend) and not isinstance(game, SplitMatch):
+                    capture = start_capture(screen, game.match_uuid)
                 while game.running:
-                    dt = clock.tick(60)
-                    for event in pygame.event.get():
+                    dt = pacer.tick()
+                    # Advance timers first so input is sampled as late as possible before drawing
+                    if not paused:
+                        game.update(dt)
+                    events = input_pipeline.poll()
+                    moved = False
+                    for stamp, event in events:
                         if event.type == pygame.QUIT:
                             game.running = False
                         elif event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_ESCAPE:
+                            if event.key == pygame.K_F3:
+                                input_pipeline.debug = not input_pipeline.debug
+                            elif event.key == pygame.K_ESCAPE:
                                 if paused:
                                     pause_duration = pygame.time.get_ticks() - pause_start_time
-                                    for player in [game.player1, game.player2]:
+                                    for player in game.players:
                                         if player.start_time is not None:
                                             player.pause_offset += pause_duration
                                     paused = False
@@ -188,46 +333,59 @@ def main():
                                     pause_start_time = pygame.time.get_ticks()
                                     paused = True
                             elif not paused:
-                                if event.key == player1_controls["shoot"] and not game.player1.frozen:
-                                    game.player1.shoot(game, shoot_sound, hit_sound)
-                                elif event.key == player2_controls["shoot"] and not game.player2.frozen:
-                                    game.player2.shoot(game, shoot_sound, hit_sound)
+                                shooter = game.player_for_key(event.key)
+                                if shooter and not shooter.frozen:
+                                    shooter.shoot(game, *seat_sounds[game.players.index(shooter)])
+                                    input_pipeline.mark("shot", stamp)
                         elif event.type == pygame.MOUSEBUTTONDOWN and paused:
                             if resume_rect.collidepoint(event.pos):
                                 pause_duration = pygame.time.get_ticks() - pause_start_time
-                                for player in [game.player1, game.player2]:
+                                for player in game.players:
                                     if player.start_time is not None:
                                         player.pause_offset += pause_duration
                                 paused = False
                                 pause_start_time = None
                             elif quit_rect.collidepoint(event.pos):
-                                save_game_state(game, conn)
+                                if two_player:
+                                    save_game_state(game, db)
                                 game.running = False
 
                     if not paused:
-                        keys = pygame.key.get_pressed()
-                        game.player1.move_aim(keys, SCREEN_WIDTH, SCREEN_HEIGHT)
-                        game.player2.move_aim(keys, SCREEN_WIDTH, SCREEN_HEIGHT)
-                        game.update(dt)
+                        stamp, keys = input_pipeline.sample_keys()
+                        for player in game.players:
+                            if player.move_aim(keys, SCREEN_WIDTH, SCREEN_HEIGHT):
+                                input_pipeline.mark("aim", stamp)
+                                moved = True
+                    pacer.frame(bool(events) or moved)
+                    if spectators:
+                        spectators.publish(game)
 
-                    game.draw(screen, game_background, font)
+                    game.draw(backend, game_background, font)
                     if paused:
-                        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                        overlay.fill((0, 0, 0, 128))
-                        screen.blit(overlay, (0, 0))
-                        draw_text(screen, "Paused", (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 100), pause_menu_font, (255, 255, 255))
-                        pygame.draw.rect(screen, (0, 255, 0), resume_rect)
-                        draw_text(screen, "Resume", (resume_rect.x + 50, resume_rect.y + 15), font, (255, 255, 255))
-                        pygame.draw.rect(screen, (255, 0, 0), quit_rect)
-                        draw_text(screen, "Save and Quit", (quit_rect.x + 20, quit_rect.y + 15), font, (255, 255, 255))
-                    pygame.display.flip()
+                        draw_pause_menu(font, pause_menu_font, resume_rect, quit_rect, "Save and Quit" if two_player else "Quit")
+                    input_pipeline.draw_debug(backend, debug_font, (10, SCREEN_HEIGHT - 50))
+                    if input_pipeline.debug:
+                        backend.text(pacer.report(), (10, SCREEN_HEIGHT - 75), debug_font, (255, 255, 0))
+                    backend.present()
+                    input_pipeline.presented()
+                    if capture:
+                        capture.grab(screen)
 
+                if capture:
+                    capture.close()  # Logs the throughput and dropped-frame report
+                shot_recorder.flush()  # Hand this match's shots to the writer thread
+                if spectators:
+                    spectators.end()
+                announcer.announce_result(game.players)
                 # Save scores
-                save_scores(game.player1, game.player2, conn)
+                if two_player:
+                    save_scores(game.player1, game.player2, db, game.match_uuid)
 
                 # End-game screen
-                replay_rect = pygame.Rect(SCREEN_WIDTH // 2 - 210, (SCREEN_HEIGHT // 2)+10, 200, 50)
-                menu_rect = pygame.Rect(SCREEN_WIDTH // 2 + 10, (SCREEN_HEIGHT // 2)+10, 200, 50)
+                memory.scene("game_over")
+                buttons_y = (SCREEN_HEIGHT // 2) + 10 + (len(game.players) - 2) * 30
+                replay_rect = pygame.Rect(SCREEN_WIDTH // 2 - 210, buttons_y, 200, 50)
+                menu_rect = pygame.Rect(SCREEN_WIDTH // 2 + 10, buttons_y, 200, 50)
                 end_game_running = True
                 replay = False
                 menu = False
@@ -248,29 +406,35 @@ def main():
 
                     screen.fill((0, 0, 0))
                     draw_text(screen, "Game Over", (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 100), font, (255, 255, 255))
-                    draw_text(screen, f"{game.player1.name}: {game.player1.score}", (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50), font, game.player1.color)
-                    draw_text(screen, f"{game.player2.name}: {game.player2.score}", (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 20), font, game.player2.color)
+                    for i, player in enumerate(game.players):
+                        draw_text(screen, f"{player.name}: {player.score}", (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50 + i * 30), font, player.color)
                     pygame.draw.rect(screen, (0, 255, 0), replay_rect)
                     draw_text(screen, "Replay", (replay_rect.x + 50, replay_rect.y + 15), font, (255, 255, 255))
                     pygame.draw.rect(screen, (255, 0, 0), menu_rect)
                     draw_text(screen, "Back to Menu", (menu_rect.x + 20, menu_rect.y + 15), font, (255, 255, 255))
-                    pygame.display.flip()
+                    present()
                     clock.tick(30)
 
                 if menu:
                     break
                 elif replay:
-                    player1 = Player(player1_user, player1_controls, (255, 0, 0), SCREEN_WIDTH, SCREEN_HEIGHT)
-                    player2 = Player(player2_user, player2_controls, (0, 0, 255), SCREEN_WIDTH, SCREEN_HEIGHT)
-                    game = Game(player1, player2, SCREEN_WIDTH, SCREEN_HEIGHT)
+                    game = new_game(users)
         elif choice == "leaderboard":
-            leaderboard_screen(screen, conn, auth_background)
+            memory.scene("leaderboard")
+            leaderboard_screen(screen, db, auth_background)
+        elif choice == "history":
+            user = login_screen(screen, db, auth_background)
+            if user:
+                memory.scene("history")
+                history_screen(screen, db, auth_background, user)
         elif choice == "settings":
+            memory.scene("settings")
             player1_controls, player2_controls, sound_volume = settings_screen(
                 screen, control_schemes, player1_controls, player2_controls,
-                sound_volume, shoot_sound, hit_sound, auth_background
+                sound_volume, audio, auth_background
             )
             pygame.mixer.music.set_volume(sound_volume)  # Update music volume
+            audio.set_volume(sound_volume)  # Seat sounds and announcer phrases
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import argparse
+import sqlite3
+from database import DB_PATH
+from load import SAVE_RETENTION, ensure_saved_games_schema
+
+PAIR_KEY = "MIN(player1_uuid, player2_uuid), MAX(player1_uuid, player2_uuid)"
+
+def database_size(conn):
+    """Returns the size of the database file in bytes."""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+def deduplicate_saved_games(conn):
+    """Keeps only the newest of identical saves belonging to the same player pair."""
+    c = conn.cursor()
+    c.execute(f"""
+        DELETE FROM saved_games WHERE game_uuid IN (
+            SELECT game_uuid FROM (
+                SELECT game_uuid, ROW_NUMBER() OVER (
+                    PARTITION BY {PAIR_KEY}, game_state ORDER BY timestamp DESC, rowid DESC
+                ) AS rank
+                FROM saved_games
+            ) WHERE rank > 1
+        )
+    """)
+    return c.rowcount
+
+def prune_all_saved_games(conn, keep=SAVE_RETENTION):
+    """Applies the per-pair retention limit to every player pair."""
+    c = conn.cursor()
+    c.execute(f"""
+        DELETE FROM saved_games WHERE game_uuid IN (
+            SELECT game_uuid FROM (
+                SELECT game_uuid, ROW_NUMBER() OVER (
+                    PARTITION BY {PAIR_KEY} ORDER BY timestamp DESC, rowid DESC
+                ) AS rank
+                FROM saved_games
+            ) WHERE rank > ?
+        )
+    """, (keep,))
+    return c.rowcount
+
+def run_maintenance(path, keep=SAVE_RETENTION, vacuum=True):
+    """Deduplicates and prunes saved games, then vacuums; returns a summary dict."""
+    conn = sqlite3.connect(path)
+    ensure_saved_games_schema(conn)
+    size_before = database_size(conn)
+    with conn:
+        duplicates = deduplicate_saved_games(conn)
+        pruned = prune_all_saved_games(conn, keep)
+    if vacuum:
+        conn.execute("VACUUM")
+    size_after = database_size(conn)
+    conn.close()
+    return {
+        'duplicates': duplicates,
+        'pruned': pruned,
+        'size_before': size_before,
+        'size_after': size_after,
+        'reclaimed': size_before - size_after
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prune and compact saved games.")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    parser.add_argument("--keep", type=int, default=SAVE_RETENTION, help="saves kept per player pair")
+    parser.add_argument("--no-vacuum", action="store_true", help="skip VACUUM")
+    args = parser.parse_args()
+    report = run_maintenance(args.db, args.keep, vacuum=not args.no_vacuum)
+    print(f"Removed {report['duplicates']} duplicate and {report['pruned']} expired saves.")
+    print(f"Database size: {report['size_before']} -> {report['size_after']} bytes "
+          f"({report['reclaimed']} reclaimed).")
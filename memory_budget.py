@@ -0,0 +1,195 @@
+import argparse
+import gc
+import os
+import tracemalloc
+from collections import Counter
+import pygame
+from render_backend import load_font, track_surface, fonts as tracked_fonts, surfaces as tracked_surfaces
+
+MEMORY_TRACKING = os.environ.get('SHOOTER_MEMORY', '0') == '1'
+MEMORY_STRICT = os.environ.get('SHOOTER_MEMORY_STRICT', '0') == '1'  # Raise instead of logging (tests, soak runs)
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+ENTITY_TYPES = {'Game', 'Player', 'ShotMark', 'Target', 'TimeBonusItem', 'ScoreMultiplierItem',
+                'FreezeOpponentItem', 'ExtraBulletsItem', 'SpawnPlacer'}
+# Python allocations are attributed by the file of the innermost Python frame that made them
+FILE_CATEGORIES = {
+    'entities': {'game.py', 'player.py', 'game_objects.py', 'spawn.py'},
+    'db': {'database.py', 'load.py', 'leaderboard.py', 'history.py', 'telemetry.py', 'analytics.py',
+           'authentication.py', 'maintenance.py'},
+}
+DEFAULT_BUDGETS = {
+    'python_mb': 32.0,  # Python heap traced by tracemalloc
+    'surface_mb': 64.0,  # Pixel data of live Surfaces (allocated by SDL, invisible to tracemalloc)
+    'fonts': 32,
+    'entities': 5000,
+    'scene_growth_mb': 2.0,  # Python heap growth between two visits to the same scene
+}
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a scene transition is over budget."""
+
+def load_budgets(spec=os.environ.get('SHOOTER_MEMORY_BUDGETS', '')):
+    """Returns the default budgets overridden by a spec like 'python_mb=24,fonts=16'."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in filter(None, spec.split(',')):
+        key, value = item.split('=')
+        budgets[key.strip()] = float(value)
+    return budgets
+
+def category(filename):
+    """Maps a source file to the category its allocations are charged to."""
+    name = os.path.basename(filename)
+    for label, files in FILE_CATEGORIES.items():
+        if name in files:
+            return label
+    if os.sep + 'sqlite3' + os.sep in filename:
+        return 'db'
+    if os.path.isabs(filename) and os.path.dirname(filename) == REPO_DIR:
+        return 'ui'
+    return 'other'
+
+def census():
+    """Counts live Surfaces (with their pixel bytes), Fonts and game entities.
+
+    Fonts and Surfaces made through render_backend's load_font/track_surface are
+    counted from its registry, even when only a function local holds them. Others
+    are found through the gc-tracked objects (instances, lists, dicts) that refer to them.
+    """
+    surfaces = {id(surface): surface for surface in tracked_surfaces}
+    fonts = {id(font): font for font in tracked_fonts}
+    entities = Counter()
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in ENTITY_TYPES:
+            entities[name] += 1
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface):
+                surfaces[id(ref)] = ref
+            elif isinstance(ref, pygame.font.Font):
+                fonts[id(ref)] = ref
+    pixel_bytes = sum(surface.get_pitch() * surface.get_height() for surface in surfaces.values())
+    return {'surfaces': len(surfaces), 'surface_mb': pixel_bytes / 1e6, 'fonts': len(fonts),
+            'entities': sum(entities.values()), 'entity_types': entities}
+
+class MemoryTracker:
+    """Snapshots memory at scene transitions, attributes growth and checks budgets."""
+    def __init__(self, budgets=None, strict=MEMORY_STRICT, enabled=MEMORY_TRACKING):
+        self.enabled = enabled
+        self.budgets = budgets or load_budgets()
+        self.strict = strict
+        self.previous = None  # Snapshot taken at the last transition
+        self.visits = {}  # Scene -> traced bytes at its previous visit
+        self.reports = []
+        if enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            census()  # The first pass trips pygame's lazy module imports
+            self.previous = self.snapshot()  # Baseline; also loads what snapshotting itself imports
+
+    def scene(self, name):
+        """Records entering a scene; returns the report, or None when tracking is off."""
+        if not self.enabled:
+            return None
+        snapshot = self.snapshot()
+        traced = sum(stat.size for stat in snapshot.statistics('filename'))  # Excludes the snapshots themselves
+        peak = tracemalloc.get_traced_memory()[1]
+        report = {'scene': name, 'python_mb': traced / 1e6, 'peak_mb': peak / 1e6, 'growth': {},
+                  'scene_growth_mb': 0.0}
+        report.update(census())
+        if self.previous is not None:
+            report['growth'] = self.growth(self.previous, snapshot)
+        if name in self.visits:
+            report['scene_growth_mb'] = (traced - self.visits[name]) / 1e6
+        self.visits[name] = traced
+        self.previous = snapshot
+        self.reports.append(report)
+        print(self.summary(report))
+        self.check(report)
+        return report
+
+    def snapshot(self):
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def growth(self, old, new):
+        """Megabytes gained per category between two snapshots."""
+        totals = Counter()
+        for stat in new.compare_to(old, 'filename'):
+            totals[category(stat.traceback[0].filename)] += stat.size_diff
+        return {label: size / 1e6 for label, size in totals.items()}
+
+    def check(self, report):
+        """Logs, or raises in strict mode, when any budget is exceeded."""
+        over = [f"{key} {report[key]:.2f} > {limit:g}" for key, limit in self.budgets.items()
+                if report.get(key, 0) > limit]
+        if not over:
+            return
+        message = f"Memory budget exceeded entering {report['scene']}: " + ", ".join(over)
+        if self.strict:
+            raise MemoryBudgetExceeded(message)
+        print(message)
+
+    def summary(self, report):
+        growth = " ".join(f"{label}:{size:+.2f}" for label, size in sorted(report['growth'].items()))
+        return (f"[memory] {report['scene']}: python {report['python_mb']:.1f} MB, "
+                f"surfaces {report['surfaces']} ({report['surface_mb']:.1f} MB), fonts {report['fonts']}, "
+                f"entities {report['entities']} | growth MB {growth or '-'}")
+
+def soak(matches, strict):
+    """Plays matches headlessly the way the replay loop does and tracks memory after each."""
+    import json
+    import random
+    import tempfile
+    from database import Database
+    from game import Game
+    from load import save_game_state, ensure_saved_games_schema
+    from render_backend import SurfaceBackend
+    from bench_arena import make_game, SilentSound, SCREEN_WIDTH, SCREEN_HEIGHT
+
+    pygame.init()
+    backend = SurfaceBackend(pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT)))
+    background = track_surface(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - 50)))
+    directory = tempfile.TemporaryDirectory()
+    db = Database(os.path.join(directory.name, 'soak.db'))
+    db.execute('''CREATE TABLE saved_games (game_uuid TEXT PRIMARY KEY, player1_uuid TEXT, player2_uuid TEXT,
+                  game_state TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    db.write(ensure_saved_games_schema)
+    tracker = MemoryTracker(strict=strict, enabled=True)
+    sound = SilentSound()
+    random.seed(0)
+    for match in range(matches):
+        game = make_game(2)
+        for player in game.players:
+            player.bullets = 10
+        font = load_font(40)
+        tick = 0
+        while game.running:
+            game.update(16)
+            held = {key: random.random() < 0.3 for player in game.players for key in player.controls.values()}
+            for player in game.players:
+                player.move_aim(held, SCREEN_WIDTH, SCREEN_HEIGHT)
+            if tick % 3 == 0:
+                random.choice(game.players).shoot(game, sound, sound)
+            game.draw(backend, background, font)
+            if tick % 10 == 0:
+                backend.fill_rect((0, 0, 0, 128), (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))  # Pause overlay
+            tick += 1
+        save_game_state(game, db)
+        state = db.query_one("SELECT game_state FROM saved_games ORDER BY timestamp DESC LIMIT 1")[0]
+        Game.from_dict(json.loads(state), [p.user for p in game.players], SCREEN_WIDTH, SCREEN_HEIGHT)
+        tracker.scene("match")
+    db.close()
+    directory.cleanup()
+    return tracker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless soak test: loops matches and checks memory budgets.")
+    parser.add_argument("--matches", type=int, default=50)
+    parser.add_argument("--strict", action="store_true", help="fail on the first budget overrun")
+    args = parser.parse_args()
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    tracker = soak(args.matches, args.strict or MEMORY_STRICT)
+    first, last = tracker.reports[0], tracker.reports[-1]
+    print(f"{args.matches} matches: python heap {first['python_mb']:.2f} -> {last['python_mb']:.2f} MB, "
+          f"surfaces {first['surfaces']} -> {last['surfaces']}, fonts {first['fonts']} -> {last['fonts']}")
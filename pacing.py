@@ -0,0 +1,65 @@
+import os
+import time
+
+ADAPTIVE_PACING = os.environ.get('SHOOTER_ADAPTIVE_FPS', '0') == '1'
+FULL_RATE = 60
+DEFAULT_IDLE_RATE = 10  # Enough for the once-a-second timer
+IDLE_AFTER_FRAMES = 30  # Half a second without input before slowing down
+
+def idle_rate(value=os.environ.get('SHOOTER_IDLE_FPS', str(DEFAULT_IDLE_RATE))):
+    """Returns the idle frame rate, or the default if it is not between 0 and FULL_RATE."""
+    try:
+        rate = int(value)
+    except ValueError:
+        rate = 0
+    if not 0 < rate < FULL_RATE:
+        print(f"SHOOTER_IDLE_FPS must be between 1 and {FULL_RATE - 1}, not {value!r}; using {DEFAULT_IDLE_RATE}")
+        return DEFAULT_IDLE_RATE
+    return rate
+
+IDLE_RATE = idle_rate()
+
+class FramePacer:
+    """Runs the match loop at full rate while anything moves and at a low rate when idle.
+
+    Both rates sleep in the input pipeline's wait, which stamps events as they
+    arrive. At the low rate the first input ends the sleep immediately instead
+    of at the next frame boundary.
+    """
+    def __init__(self, clock, pipeline, full_rate=FULL_RATE, idle_rate=IDLE_RATE, adaptive=ADAPTIVE_PACING):
+        if not 0 < idle_rate < full_rate:
+            raise ValueError(f"idle rate {idle_rate} must be above 0 and below the full rate {full_rate}")
+        self.clock = clock
+        self.pipeline = pipeline
+        self.full_rate = full_rate
+        self.idle_rate = idle_rate
+        self.adaptive = adaptive
+        self.idle_frames = 0
+        self.last_tick = time.perf_counter()
+        self.seconds = {"full": 0.0, "idle": 0.0}  # Time spent in each mode
+
+    @property
+    def idle(self):
+        return self.adaptive and self.idle_frames >= IDLE_AFTER_FRAMES
+
+    def tick(self):
+        """Waits for the next frame and returns the elapsed milliseconds."""
+        idle = self.idle
+        rate = self.idle_rate if idle else self.full_rate
+        remaining = 1.0 / rate - (time.perf_counter() - self.last_tick)
+        if self.pipeline.wait(remaining, until_event=idle):
+            self.idle_frames = 0
+        dt = self.clock.tick()
+        now = time.perf_counter()
+        self.seconds["idle" if idle else "full"] += now - self.last_tick
+        self.last_tick = now
+        return dt
+
+    def frame(self, active):
+        """Reports whether this frame had input or movement."""
+        self.idle_frames = 0 if active else self.idle_frames + 1
+
+    def report(self):
+        """Returns the time spent at each rate, e.g. for the debug view."""
+        rates = {"full": self.full_rate, "idle": self.idle_rate}
+        return " | ".join(f"{mode} {rates[mode]} fps: {seconds:.1f}s" for mode, seconds in self.seconds.items())
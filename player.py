@@ -36,7 +36,8 @@ class Player:
             self.time_left = max(0, 60000 + self.extra_time - elapsed)
 
     def move_aim(self, keys, screen_width, screen_height):
-        """Moves the player's aim, restricted below the thing"""
+        """Moves the player's aim, restricted below the thing. Returns True if it moved."""
+        previous = tuple(self.aim_position)
         if not self.frozen:
             speed = 3
             if keys[self.controls["up"]]:
@@ -49,6 +50,7 @@ class Player:
                 self.aim_position[0] += speed
             self.aim_position[0] = max(0, min(screen_width, self.aim_position[0]))
             self.aim_position[1] = max(50, min(screen_height, self.aim_position[1]))
+        return tuple(self.aim_position) != previous
 
     def shoot(self, game, shoot_sound, hit_sound):
         """Handles shooting logic with scoring based on distance from previous shot."""
@@ -59,13 +61,17 @@ class Player:
         shot_mark = ShotMark(self.aim_position[0], self.aim_position[1], self.color)
         self.shot_marks.append(shot_mark)
         hit_regular_target = False
+        hit_target = None
+        base_points = multiplier = streak_bonus = 0
 
         for target in game.targets[:]:
-            if math.hypot(self.aim_position[0] - target.x, self.aim_position[1] - target.y) < 20:
+            if target.hit_test(self.aim_position[0], self.aim_position[1]):
                 hit_sound.play()
+                hit_target = target
                 if hasattr(target, 'effect'):
                     target.effect(self, game) if isinstance(target, FreezeOpponentItem) else target.effect(self)
-                    game.targets.remove(target)
+                    game.announce_pickup(target)
+                    game.remove_target(target)
                 else:
                     hit_regular_target = True
                     if self.last_shot_position:
@@ -76,13 +82,16 @@ class Player:
                         base_points = min(10, max(1, int(distance / 20)))
                     else:
                         base_points = 5
-                    self.score += base_points * self.next_hit_multiplier
+                    multiplier = self.next_hit_multiplier
+                    self.score += base_points * multiplier
                     self.next_hit_multiplier = 1
                     if self.last_shot_was_hit:
-                        self.score += 2
-                    game.targets.remove(target)
+                        streak_bonus = 2
+                        self.score += streak_bonus
+                    game.remove_target(target)
                     game.spawn_target()
                 break
+        game.record_shot(self, hit_target, base_points, multiplier, streak_bonus)
         self.last_shot_was_hit = hit_regular_target
         self.last_shot_position = self.aim_position.copy()
 
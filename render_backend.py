@@ -0,0 +1,159 @@
+import os
+import weakref
+from collections import OrderedDict
+import pygame
+
+RENDERER = os.environ.get('SHOOTER_RENDERER', 'surface')  # "surface" or "texture"
+TEXT_CACHE_SIZE = 256  # Rendered strings kept as textures
+
+_active = None
+# Long-lived Fonts and Surfaces, registered by the helpers below so the memory census
+# counts them even when only a function local holds them
+fonts = weakref.WeakSet()
+surfaces = weakref.WeakSet()
+
+def load_font(size, name=None):
+    """Creates a Font and registers it with the memory census."""
+    font = pygame.font.Font(name, size)
+    fonts.add(font)
+    return font
+
+def track_surface(surface):
+    """Registers a Surface with the memory census and returns it."""
+    surfaces.add(surface)
+    return surface
+
+def present():
+    """Shows the finished menu frame using whichever backend is active."""
+    if _active is None:
+        pygame.display.flip()
+    else:
+        _active.flip()
+
+def create_backend(size, title, icon, kind=RENDERER):
+    """Opens the game window with the requested backend and makes it active."""
+    global _active
+    if kind == "texture":
+        _active = TextureBackend(size, title, icon)
+    else:
+        pygame.display.set_caption(title)
+        pygame.display.set_icon(icon)
+        _active = SurfaceBackend(track_surface(pygame.display.set_mode(size)))
+    return _active
+
+class SurfaceBackend:
+    """Software backend that blits straight into the display surface."""
+    def __init__(self, screen):
+        self.screen = screen
+        self.overlays = {}  # (color, size) -> translucent surface, built once
+
+    def blit(self, image, pos):
+        """Draws an image at a position or rect."""
+        self.screen.blit(image, pos)
+
+    def fill_rect(self, color, rect):
+        """Fills a rectangle; colors with an alpha component are blended."""
+        rect = pygame.Rect(rect)
+        if len(color) == 4:
+            key = (tuple(color), rect.size)
+            if key not in self.overlays:
+                overlay = pygame.Surface(rect.size, pygame.SRCALPHA)
+                overlay.fill(color)
+                self.overlays[key] = overlay
+            self.screen.blit(self.overlays[key], rect)
+        else:
+            pygame.draw.rect(self.screen, color, rect)
+
+    def circle(self, color, center, radius):
+        """Draws a filled circle."""
+        pygame.draw.circle(self.screen, color, center, radius)
+
+    def text(self, text, pos, font, color=(0, 0, 0), anchor="topleft"):
+        """Renders text with the given rect anchor placed at pos."""
+        text_surface = font.render(text, True, color)
+        self.screen.blit(text_surface, text_surface.get_rect(**{anchor: pos}))
+
+    def flip(self):
+        """Shows the menu frame drawn into the display surface."""
+        pygame.display.flip()
+
+    def present(self):
+        """Shows the match frame."""
+        pygame.display.flip()
+
+class TextureBackend:
+    """GPU-or-software backend built on SDL2 Renderer/Texture.
+
+    Images are uploaded once and drawn as batched texture copies; the renderer's
+    logical size scales the frame to any window size. Menus still draw into
+    `screen`, an offscreen surface streamed to a texture on flip().
+    """
+    def __init__(self, size, title, icon):
+        from pygame._sdl2.video import Window, Renderer, Texture, error
+        self.Texture = Texture
+        os.environ.setdefault('SDL_RENDER_BATCHING', '1')
+        self.window = Window(title, size=size, resizable=True)
+        self.window.set_icon(icon)
+        try:
+            self.renderer = Renderer(self.window, accelerated=1)
+        except error:
+            self.renderer = Renderer(self.window, accelerated=0)  # SDL's software renderer
+        self.renderer.logical_size = size
+        # Surface.convert() still needs a display format, so keep a hidden 1x1 display mode
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        self.screen = track_surface(pygame.Surface(size))
+        self.screen_texture = Texture(self.renderer, size, streaming=True)
+        self.textures = weakref.WeakKeyDictionary()
+        self.text_cache = OrderedDict()
+        self.circles = {}
+
+    def texture(self, image):
+        """Returns the texture for a surface, uploading it the first time it is seen."""
+        texture = self.textures.get(image)
+        if texture is None:
+            texture = self.Texture.from_surface(self.renderer, image)
+            self.textures[image] = texture
+        return texture
+
+    def blit(self, image, pos):
+        """Copies an image's texture to a position or rect."""
+        texture = self.texture(image)
+        texture.draw(dstrect=pygame.Rect(pos[0], pos[1], texture.width, texture.height))
+
+    def fill_rect(self, color, rect):
+        """Fills a rectangle; colors with an alpha component are blended."""
+        self.renderer.draw_blend_mode = 1 if len(color) == 4 else 0
+        self.renderer.draw_color = color
+        self.renderer.fill_rect(pygame.Rect(rect))
+
+    def circle(self, color, center, radius):
+        """Draws a filled circle from a cached circle texture."""
+        key = (tuple(color), radius)
+        if key not in self.circles:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, (radius, radius), radius)
+            self.circles[key] = self.Texture.from_surface(self.renderer, surface)
+        texture = self.circles[key]
+        texture.draw(dstrect=texture.get_rect(center=center))
+
+    def text(self, text, pos, font, color=(0, 0, 0), anchor="topleft"):
+        """Draws text from a small LRU cache of rendered string textures."""
+        key = (text, font, tuple(color))  # The font itself: an id could be reused by a new font of another size
+        texture = self.text_cache.pop(key, None)
+        if texture is None:
+            texture = self.Texture.from_surface(self.renderer, font.render(text, True, color))
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.popitem(last=False)
+        self.text_cache[key] = texture
+        texture.draw(dstrect=texture.get_rect(**{anchor: pos}))
+
+    def flip(self):
+        """Streams the menu surface to the window."""
+        self.screen_texture.update(self.screen)
+        self.renderer.clear()
+        self.screen_texture.draw()
+        self.renderer.present()
+
+    def present(self):
+        """Submits the batched match frame."""
+        self.renderer.present()
@@ -1,9 +1,10 @@
 import pygame
+from render_backend import present, load_font
 
 def settings_screen(screen, control_schemes, player1_controls, player2_controls, sound_volume,
-                    shoot_sound, hit_sound, background_image):
+                    audio, background_image):
     """Allows players to adjust sound volume and set custom controls."""
-    font = pygame.font.Font(None, 32)
+    font = load_font(32)
     mute_rect = pygame.Rect(100, 100, 100, 50)
     unmute_rect = pygame.Rect(100, 160, 100, 50)
     p1_set_controls_rect = pygame.Rect(100, 220, 150, 50)
@@ -19,13 +20,11 @@ def settings_screen(screen, control_schemes, player1_controls, player2_controls,
                 if mute_rect.collidepoint(event.pos):
                     sound_volume = 0
                     pygame.mixer.music.set_volume(0)
-                    shoot_sound.set_volume(0)
-                    hit_sound.set_volume(0)
+                    audio.set_volume(0)  # Every bank sound, including announcer phrases
                 elif unmute_rect.collidepoint(event.pos):
                     sound_volume = 1.0
                     pygame.mixer.music.set_volume(1.0)
-                    shoot_sound.set_volume(1.0)
-                    hit_sound.set_volume(1.0)
+                    audio.set_volume(1.0)
                 elif p1_set_controls_rect.collidepoint(event.pos):
                     custom = get_custom_controls(screen, "Player 1", background_image)
                     player1_controls.clear()
@@ -46,18 +45,18 @@ def settings_screen(screen, control_schemes, player1_controls, player2_controls,
         draw_text(screen, "P1: Set", (110, 230), font)
         pygame.draw.rect(screen, (0, 191, 255), p2_set_controls_rect)
         draw_text(screen, "P2: Set", (310, 230), font)
-        pygame.display.flip()
+        present()
         clock.tick(30)
 
 def get_custom_controls(screen, player_name, background_image):
     """Collects custom control inputs from the player."""
     actions = ["up", "down", "left", "right", "shoot"]
     custom_controls = {}
-    font = pygame.font.Font(None, 32)
+    font = load_font(32)
     for action in actions:
         screen.blit(background_image, (0, 0))
         draw_text(screen, f"{player_name}: Press key for {action}", (10, 10), font)
-        pygame.display.flip()
+        present()
         key = wait_for_key()
         custom_controls[action] = key
     return custom_controls
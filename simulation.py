@@ -0,0 +1,409 @@
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+from game import Game, TARGET_TYPES, MAX_PLAYERS
+from game_objects import load_sprite
+from player import Player
+from render_backend import load_font
+
+SPLIT_SIMULATION = os.environ.get('SHOOTER_SPLIT_SIM', '0') == '1'
+TICK_RATE = 60  # Simulation ticks per second, independent of the render frame rate
+MAX_TARGETS = 32
+MAX_MARKS = 64  # Most recent shot marks kept per player
+
+# Header fields (int64)
+PUBLISHED, SEQUENCE_0, SEQUENCE_1, RUNNING, TICKS, INTERVAL_SUM_US, INTERVAL_SQ_SUM_US, MAX_INTERVAL_US, LATE_TICKS = range(9)
+HEADER_FIELDS = 9
+# Player fields (int32)
+AIM_X, AIM_Y, SCORE, BULLETS, TIME_LEFT, FROZEN, SHOTS, HITS, MARK_COUNT = range(9)
+PLAYER_FIELDS = 9
+# Target fields (int32)
+TARGET_TYPE, TARGET_X, TARGET_Y = range(3)
+TARGET_FIELDS = 3
+TARGET_CODES = list(TARGET_TYPES)  # Type code -> class name
+
+PLAYERS_BYTES = MAX_PLAYERS * PLAYER_FIELDS * 4
+MARKS_BYTES = MAX_PLAYERS * MAX_MARKS * 2 * 4
+TARGETS_BYTES = MAX_TARGETS * TARGET_FIELDS * 4
+BUFFER_BYTES = PLAYERS_BYTES + MARKS_BYTES + TARGETS_BYTES + 2 * 4
+HEADER_BYTES = HEADER_FIELDS * 8
+
+def state_views(buf, offset=0):
+    """Returns (players, marks, targets, counts) numpy views over one packed state in buf."""
+    players = np.ndarray((MAX_PLAYERS, PLAYER_FIELDS), np.int32, buf, offset)
+    offset += PLAYERS_BYTES
+    marks = np.ndarray((MAX_PLAYERS, MAX_MARKS, 2), np.int32, buf, offset)
+    offset += MARKS_BYTES
+    targets = np.ndarray((MAX_TARGETS, TARGET_FIELDS), np.int32, buf, offset)
+    offset += TARGETS_BYTES
+    counts = np.ndarray((2,), np.int32, buf, offset)  # players, targets
+    return players, marks, targets, counts
+
+class StateBuffers:
+    """Fixed-layout, double-buffered match state in shared memory.
+
+    The writer fills the buffer that is not published, bracketing the write with
+    a sequence bump (odd while writing), then publishes it. Readers copy the
+    published buffer out and retry the copy if the sequence moved.
+    """
+    def __init__(self, name=None):
+        create = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=HEADER_BYTES + 2 * BUFFER_BYTES)
+        buf = self.shm.buf
+        self.header = np.ndarray((HEADER_FIELDS,), np.int64, buf, 0)
+        self.players, self.marks, self.targets, self.counts = [], [], [], []
+        self.buffers = [np.ndarray((BUFFER_BYTES // 4,), np.int32, buf, HEADER_BYTES + index * BUFFER_BYTES)
+                        for index in range(2)]  # Each packed state as one flat array, for copying
+        for index in range(2):
+            players, marks, targets, counts = state_views(buf, HEADER_BYTES + index * BUFFER_BYTES)
+            self.players.append(players)
+            self.marks.append(marks)
+            self.targets.append(targets)
+            self.counts.append(counts)
+        if create:
+            self.header[:] = 0
+            self.header[RUNNING] = 1
+        self.written_marks = [[0] * MAX_PLAYERS, [0] * MAX_PLAYERS]  # Writer-side bookkeeping
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, game, shot_counts=None):
+        """Writes the game into the idle buffer and makes it the published one."""
+        index = 1 - int(self.header[PUBLISHED])
+        self.header[SEQUENCE_0 + index] += 1
+        pack_game(game, self.players[index], self.marks[index], self.targets[index],
+                  self.counts[index], self.written_marks[index], shot_counts)
+        self.header[SEQUENCE_0 + index] += 1
+        self.header[PUBLISHED] = index
+
+    def begin_read(self):
+        """Returns (buffer index, sequence) of a consistent published buffer."""
+        while True:
+            index = int(self.header[PUBLISHED])
+            sequence = int(self.header[SEQUENCE_0 + index])
+            if sequence % 2 == 0:
+                return index, sequence
+
+    def end_read(self, index, sequence):
+        """True if the buffer was not rewritten while it was being read."""
+        return int(self.header[SEQUENCE_0 + index]) == sequence
+
+    def read_into(self, out):
+        """Copies a consistent published state into out (BUFFER_BYTES of int32)."""
+        while True:
+            index, sequence = self.begin_read()
+            np.copyto(out, self.buffers[index])  # A few microseconds, far shorter than a tick
+            if self.end_read(index, sequence):
+                return
+
+    def close(self, unlink=False):
+        """Releases the views and the shared block."""
+        self.header = self.players = self.marks = self.targets = self.counts = self.buffers = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def pack_game(game, players, marks, targets, counts, written_marks, shot_counts=None):
+    """Copies a Game into fixed-layout arrays; only new shot marks are written.
+
+    shot_counts holds one (shots, hits) CountingSound pair per seat, if any.
+    """
+    counts[0] = len(game.players)
+    for i, player in enumerate(game.players):
+        row = players[i]
+        row[AIM_X], row[AIM_Y] = player.aim_position
+        row[SCORE] = player.score
+        row[BULLETS] = player.bullets
+        row[TIME_LEFT] = player.time_left
+        row[FROZEN] = player.frozen
+        total = len(player.shot_marks)
+        for n in range(max(written_marks[i], total - MAX_MARKS), total):
+            mark = player.shot_marks[n]
+            marks[i, n % MAX_MARKS] = (mark.x, mark.y)
+        written_marks[i] = total
+        row[MARK_COUNT] = total
+        if shot_counts is not None:
+            row[SHOTS], row[HITS] = shot_counts[i][0].count, shot_counts[i][1].count
+    visible = game.targets[:MAX_TARGETS]
+    counts[1] = len(visible)
+    for i, target in enumerate(visible):
+        targets[i] = (TARGET_CODES.index(type(target).__name__), target.x, target.y)
+
+class CountingSound:
+    """Stands in for a sound in the simulation; the render process plays the real one when the count moves."""
+    def __init__(self):
+        self.count = 0
+
+    def play(self):
+        self.count += 1
+
+def simulation_main(shm_name, users, controls, screen_width, screen_height, commands, match_uuid, db_path, tick_rate):
+    """Runs the game logic at a fixed tick in the child process."""
+    from telemetry import ShotRecorder
+    state = StateBuffers(shm_name)
+    players = [Player(user, controls[i], color, screen_width, screen_height)
+               for i, (user, color) in enumerate(users)]
+    game = Game(players, screen_width, screen_height)
+    game.match_uuid = match_uuid
+    if db_path:
+        game.shot_recorder = ShotRecorder(db_path)
+    sounds = [(CountingSound(), CountingSound()) for _ in players]
+    held = {c[action]: False for c in controls for action in ("up", "down", "left", "right")}  # Until the first "keys"
+    paused_at = None
+    started = False
+    period = 1.0 / tick_rate
+    next_tick = time.perf_counter()
+    last_tick = None
+    carry_ms = 0.0  # Fraction of a millisecond not yet passed to game.update
+    state.publish(game, sounds)
+
+    while game.running:
+        next_tick += period
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.perf_counter()
+        carry_ms += (now - last_tick) * 1000 if last_tick is not None else period * 1000
+        if last_tick is not None:
+            interval = int((now - last_tick) * 1e6)
+            state.header[TICKS] += 1
+            state.header[INTERVAL_SUM_US] += interval
+            state.header[INTERVAL_SQ_SUM_US] += interval * interval // 1000
+            state.header[MAX_INTERVAL_US] = max(int(state.header[MAX_INTERVAL_US]), interval)
+            if interval > period * 1.5e6:
+                state.header[LATE_TICKS] += 1
+        last_tick = now
+        if now - next_tick > period:
+            next_tick = now  # Fell badly behind; don't burst to catch up
+
+        while True:
+            try:
+                command = commands.get_nowait()
+            except queue.Empty:
+                break
+            kind = command[0]
+            if kind == "keys":
+                held = command[1]
+            elif kind == "shoot" and started and paused_at is None:
+                shooter = game.players[command[1]]
+                if not shooter.frozen:
+                    shooter.shoot(game, *sounds[command[1]])
+            elif kind == "start":
+                game.start_timers()
+                started = True
+            elif kind == "pause":
+                paused_at = pygame.time.get_ticks()
+            elif kind == "resume" and paused_at is not None:
+                for player in game.players:
+                    if player.start_time is not None:
+                        player.pause_offset += pygame.time.get_ticks() - paused_at
+                paused_at = None
+            elif kind == "stop":
+                game.running = False
+
+        if started and paused_at is None:
+            step_ms = int(carry_ms)  # Measured time, so timers keep pace with the wall clock
+            carry_ms -= step_ms
+            game.update(step_ms)
+            for player in game.players:
+                player.move_aim(held, screen_width, screen_height)
+        else:
+            carry_ms = 0.0  # Time before the start or while paused is not game time
+        state.publish(game, sounds)
+
+    if game.shot_recorder is not None:
+        game.shot_recorder.close()
+    state.header[RUNNING] = 0
+    state.close()
+
+def draw_state(screen, background_image, font, hud_font, roster, screen_width, hud_height,
+               players, marks, targets, counts):
+    """Draws a packed state through a render backend; roster holds (name, color) per seat."""
+    player_count, target_count = int(counts[0]), int(counts[1])
+    screen.fill_rect((50, 50, 50), (0, 0, screen_width, hud_height))
+    if player_count <= 2:
+        for seat, (pos, anchor) in enumerate((((10, 10), "topleft"), ((screen_width - 10, 10), "topright"))[:player_count]):
+            name, color = roster[seat]
+            row = players[seat]
+            text = f"{name}: {row[SCORE]} Bullets: {row[BULLETS]} Time: {max(0, row[TIME_LEFT] // 1000)}"
+            screen.text(text, pos, font, color, anchor=anchor)
+    else:
+        columns = (player_count + 1) // 2
+        cell_width = screen_width // columns
+        for seat in range(player_count):
+            name, color = roster[seat]
+            row = players[seat]
+            text = f"{name}: {row[SCORE]} B:{row[BULLETS]} T:{max(0, row[TIME_LEFT] // 1000)}"
+            screen.text(text, ((seat % columns) * cell_width + 6, (seat // columns) * 25 + 5), hud_font, color)
+    screen.blit(background_image, (0, hud_height))
+    for i in range(target_count):
+        code, x, y = targets[i]
+        image, _ = load_sprite(TARGET_TYPES[TARGET_CODES[code]].sprite_path)
+        screen.blit(image, image.get_rect(center=(int(x), int(y))))
+    for seat in range(player_count):
+        color = roster[seat][1]
+        for n in range(min(int(players[seat, MARK_COUNT]), MAX_MARKS)):
+            screen.circle(color, (int(marks[seat, n, 0]), int(marks[seat, n, 1])), 5)
+
+class PlayerView:
+    """Read-only player facade over the shared state, for HUDs and the end screen."""
+    def __init__(self, match, seat, user, color):
+        self.match = match
+        self.seat = seat
+        self.user = user
+        self.name = user.username
+        self.uuid = user.uuid
+        self.color = color
+        self.final = None  # Last published row, kept once the shared block is freed
+
+    def field(self, field):
+        if self.final is not None:
+            return int(self.final[field])
+        index = int(self.match.state.header[PUBLISHED])
+        return int(self.match.state.players[index][self.seat, field])
+
+    @property
+    def score(self):
+        return self.field(SCORE)
+
+    @property
+    def bullets(self):
+        return self.field(BULLETS)
+
+    @property
+    def time_left(self):
+        return self.field(TIME_LEFT)
+
+class SplitMatch:
+    """A match whose logic runs in a separate process at a fixed tick.
+
+    The render side sends input over a small command queue and reads state from
+    StateBuffers. Uses the fork start method so the child inherits the already
+    converted sprites and never needs a display of its own.
+    """
+    def __init__(self, users, controls, colors, screen_width, screen_height, db_path=None, tick_rate=TICK_RATE):
+        context = multiprocessing.get_context("fork")
+        self.state = StateBuffers()
+        self.commands = context.Queue()
+        self.controls = controls[:len(users)]
+        self.screen_width = screen_width
+        self.hud_height = 50
+        self.players = [PlayerView(self, i, user, colors[i]) for i, user in enumerate(users)]
+        self.shoot_keys = {c["shoot"]: i for i, c in enumerate(self.controls)}
+        self.aim_keys = [c[action] for c in self.controls for action in ("up", "down", "left", "right")]
+        self.held = {}
+        self.heard = [(0, 0)] * len(users)  # (shots, hits) last seen, to trigger sounds
+        self.is_new = True
+        self.lineage_uuid = None
+        self.hud_font = None
+        self.snapshot = np.zeros(BUFFER_BYTES // 4, np.int32)  # Drawn from, so a slow frame never races the writer
+        self.snapshot_views = state_views(self.snapshot.data)
+        self.match_uuid = str(uuid.uuid4())
+        for target_type in TARGET_TYPES.values():
+            load_sprite(target_type.sprite_path)  # Warm the cache the child inherits
+        self.process = context.Process(
+            target=simulation_main, name="simulation", daemon=True,
+            args=(self.state.name, [(u, colors[i]) for i, u in enumerate(users)], self.controls,
+                  screen_width, screen_height, self.commands, self.match_uuid, db_path, tick_rate)
+        )
+        self.process.start()
+
+    @property
+    def running(self):
+        if self.state.header is None:
+            return False
+        return bool(self.state.header[RUNNING]) and self.process.is_alive()
+
+    @running.setter
+    def running(self, value):
+        if not value:
+            self.stop()
+
+    @property
+    def player1(self):
+        return self.players[0]
+
+    @property
+    def player2(self):
+        return self.players[1]
+
+    def start_timers(self):
+        """Tells the simulation the countdown is over."""
+        self.commands.put(("start",))
+
+    def pause(self, paused):
+        """Pauses or resumes the simulation clock."""
+        self.commands.put(("pause",) if paused else ("resume",))
+
+    def stop(self):
+        """Ends the match early."""
+        if self.process.is_alive():
+            self.commands.put(("stop",))
+
+    def player_for_key(self, key):
+        """Returns the seat whose shoot key this is, or None."""
+        return self.shoot_keys.get(key)
+
+    def shoot(self, seat):
+        """Forwards a shot; the simulation resolves it on its next tick."""
+        self.commands.put(("shoot", seat))
+
+    def send_keys(self, keys):
+        """Sends the held aim keys, only when they change."""
+        held = {key: bool(keys[key]) for key in self.aim_keys}
+        if held != self.held:
+            self.held = held
+            self.commands.put(("keys", held))
+
+    def play_sounds(self, seat_sounds):
+        """Plays shot/hit sounds for shots the simulation resolved since the last frame."""
+        index = int(self.state.header[PUBLISHED])
+        players = self.state.players[index]
+        for seat in range(len(self.players)):
+            shots, hits = int(players[seat, SHOTS]), int(players[seat, HITS])
+            seen_shots, seen_hits = self.heard[seat]
+            if shots > seen_shots:
+                seat_sounds[seat][0].play()
+            if hits > seen_hits:
+                seat_sounds[seat][1].play()
+            self.heard[seat] = (shots, hits)
+
+    def draw(self, screen, background_image, font):
+        """Draws a local snapshot of the published state, however long the frame takes."""
+        self.state.read_into(self.snapshot)
+        if self.hud_font is None:
+            self.hud_font = load_font(22)
+        roster = [(view.name, view.color) for view in self.players]
+        draw_state(screen, background_image, font, self.hud_font, roster, self.screen_width, self.hud_height,
+                   *self.snapshot_views)
+
+    def tick_stats(self):
+        """Returns simulation tick statistics in milliseconds."""
+        header = self.state.header
+        ticks = int(header[TICKS])
+        if not ticks:
+            return {'ticks': 0, 'mean_ms': 0.0, 'stdev_ms': 0.0, 'max_ms': 0.0, 'late': 0}
+        mean = int(header[INTERVAL_SUM_US]) / ticks
+        variance = max(0.0, int(header[INTERVAL_SQ_SUM_US]) * 1000 / ticks - mean * mean)
+        return {'ticks': ticks, 'mean_ms': mean / 1000, 'stdev_ms': variance ** 0.5 / 1000,
+                'max_ms': int(header[MAX_INTERVAL_US]) / 1000, 'late': int(header[LATE_TICKS])}
+
+    def close(self):
+        """Stops the child process and frees the shared block, keeping the final scores."""
+        if self.state.header is None:
+            return
+        self.stop()
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        index = int(self.state.header[PUBLISHED])
+        for view in self.players:
+            view.final = self.state.players[index][view.seat].copy()
+        self.state.close(unlink=True)
@@ -0,0 +1,84 @@
+import math
+import random
+
+MIN_SPACING = 60  # Minimum distance in pixels between target centres and aim cursors
+ATTEMPTS = 30  # Candidates tried per spawn before accepting the least crowded one
+
+class SpawnPlacer:
+    """Picks well-spaced target positions using a Poisson-disk background grid.
+
+    Cells are min_spacing / sqrt(2) wide, so each holds at most one well-spaced
+    target and a candidate only has to be checked against the 5x5 cells around
+    it. Spawning therefore costs the same no matter how many targets exist.
+    """
+    def __init__(self, screen_width, screen_height, min_spacing=MIN_SPACING, margin=20, top=70):
+        self.min_spacing = min_spacing
+        self.left, self.right = margin, screen_width - margin
+        self.top, self.bottom = top, screen_height - margin
+        self.cell_size = min_spacing / math.sqrt(2)
+        self.grid = {}  # (column, row) -> list of items in that cell
+        self.cells = {}  # item -> its cell
+        self.items = []  # Placed items, for O(1) random anchors
+        self.slots = {}  # item -> index in self.items
+
+    def cell_of(self, x, y):
+        """Returns the grid cell containing a point."""
+        return int((x - self.left) / self.cell_size), int((y - self.top) / self.cell_size)
+
+    def occupy(self, item):
+        """Marks an item's position (item.x, item.y) as taken."""
+        cell = self.cell_of(item.x, item.y)
+        self.grid.setdefault(cell, []).append(item)
+        self.cells[item] = cell
+        self.slots[item] = len(self.items)
+        self.items.append(item)
+
+    def release(self, item):
+        """Frees the position held by an item."""
+        cell = self.cells.pop(item, None)
+        if cell is not None:
+            self.grid[cell].remove(item)
+            if not self.grid[cell]:
+                del self.grid[cell]
+            # Swap-remove keeps release O(1)
+            slot = self.slots.pop(item)
+            last = self.items.pop()
+            if last is not item:
+                self.items[slot] = last
+                self.slots[last] = slot
+
+    def clearance(self, x, y, avoid=()):
+        """Returns the distance to the nearest neighbour, capped at min_spacing."""
+        nearest = self.min_spacing
+        column, row = self.cell_of(x, y)
+        for dc in range(-2, 3):
+            for dr in range(-2, 3):
+                for item in self.grid.get((column + dc, row + dr), ()):
+                    nearest = min(nearest, math.hypot(item.x - x, item.y - y))
+        for ax, ay in avoid:
+            nearest = min(nearest, math.hypot(ax - x, ay - y))
+        return nearest
+
+    def candidate(self):
+        """Draws a candidate: half uniform, half in the annulus around an existing target."""
+        if self.items and random.random() < 0.5:
+            anchor = random.choice(self.items)
+            angle = random.uniform(0, 2 * math.pi)
+            distance = random.uniform(self.min_spacing, 2 * self.min_spacing)
+            x = anchor.x + math.cos(angle) * distance
+            y = anchor.y + math.sin(angle) * distance
+            if self.left <= x <= self.right and self.top <= y <= self.bottom:
+                return int(x), int(y)
+        return random.randint(self.left, self.right), random.randint(self.top, self.bottom)
+
+    def place(self, avoid=()):
+        """Returns a free position, or the least crowded candidate if none is free."""
+        best, best_clearance = None, -1
+        for _ in range(ATTEMPTS):
+            x, y = self.candidate()
+            clearance = self.clearance(x, y, avoid)
+            if clearance >= self.min_spacing:
+                return x, y
+            if clearance > best_clearance:
+                best, best_clearance = (x, y), clearance
+        return best
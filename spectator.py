@@ -0,0 +1,250 @@
+import atexit
+import json
+import multiprocessing
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pygame
+from simulation import pack_game, state_views, draw_state, BUFFER_BYTES, MAX_PLAYERS
+from render_backend import load_font
+
+SPECTATOR_ENABLED = os.environ.get('SHOOTER_SPECTATOR', '0') == '1'
+SPECTATOR_RING = os.environ.get('SHOOTER_SPECTATOR_RING', 'shooter_spectator')  # Shared-memory name
+RING_SLOTS = 256  # About four seconds of ticks at 60 Hz
+KEYFRAME_INTERVAL = 60  # A full state (with the roster) once a second, so viewers can join or resync
+ROSTER_BYTES = 2048
+ROSTER_NAME_LIMITS = (None, 32, 16, 8)  # Eight seats with 8-character names always fit in ROSTER_BYTES
+STATE_INTS = BUFFER_BYTES // 4
+
+# Frame kinds
+KEYFRAME, DELTA, END = 1, 2, 3
+# Header fields (int64)
+HEAD_SEQUENCE, LAST_KEYFRAME, OWNER_PID = range(3)
+HEADER_BYTES = 3 * 8
+SLOT_HEADER_BYTES = 16  # int64 sequence, int32 kind, int32 payload length
+SLOT_BYTES = SLOT_HEADER_BYTES + BUFFER_BYTES + ROSTER_BYTES
+
+class SpectatorRing:
+    """A single-writer ring of frames in shared memory.
+
+    Every slot starts with the sequence number of the frame in it. The writer
+    clears that number before it rewrites a slot, so a reader that was
+    overtaken can tell and goes back to the newest keyframe. Readers never
+    write to the block, so any number of them cost the game nothing.
+    """
+    def __init__(self, name, create=False):
+        size = HEADER_BYTES + RING_SLOTS * SLOT_BYTES
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        if not create and multiprocessing.parent_process() is None:
+            # A standalone viewer has its own resource tracker, which would unlink the ring when it exits
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        buf = self.shm.buf
+        self.header = np.ndarray((3,), np.int64, buf, 0)
+        self.sequences = np.ndarray((RING_SLOTS,), np.int64, buf, HEADER_BYTES, (SLOT_BYTES,))
+        self.kinds = np.ndarray((RING_SLOTS,), np.int32, buf, HEADER_BYTES + 8, (SLOT_BYTES,))
+        self.lengths = np.ndarray((RING_SLOTS,), np.int32, buf, HEADER_BYTES + 12, (SLOT_BYTES,))
+        self.payloads = np.ndarray((RING_SLOTS, BUFFER_BYTES + ROSTER_BYTES), np.uint8, buf,
+                                   HEADER_BYTES + SLOT_HEADER_BYTES, (SLOT_BYTES, 1))
+        if create:
+            self.header[:] = 0
+            self.header[OWNER_PID] = os.getpid()
+            self.sequences[:] = 0
+
+    def write(self, kind, payload):
+        """Appends one frame (a uint8 array) and returns its sequence number."""
+        sequence = int(self.header[HEAD_SEQUENCE]) + 1
+        slot = sequence % RING_SLOTS
+        self.sequences[slot] = 0
+        self.kinds[slot] = kind
+        self.lengths[slot] = len(payload)
+        self.payloads[slot, :len(payload)] = payload
+        self.sequences[slot] = sequence
+        if kind == KEYFRAME:
+            self.header[LAST_KEYFRAME] = sequence
+        self.header[HEAD_SEQUENCE] = sequence
+        return sequence
+
+    def read(self, sequence):
+        """Returns (kind, payload copy) for a frame, or None if it was overwritten."""
+        slot = sequence % RING_SLOTS
+        if self.sequences[slot] != sequence:
+            return None
+        kind = int(self.kinds[slot])
+        payload = self.payloads[slot, :int(self.lengths[slot])].copy()
+        if self.sequences[slot] != sequence:
+            return None
+        return kind, payload
+
+    def close(self, unlink=False):
+        self.header = self.sequences = self.kinds = self.lengths = self.payloads = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def owner_alive(pid):
+    """Whether the process that created a ring is still running."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+def encode_roster(players):
+    """The roster as JSON within ROSTER_BYTES; long names are shortened rather than the JSON cut."""
+    for limit in ROSTER_NAME_LIMITS:
+        roster = [{'name': player.name[:limit], 'color': list(player.color)} for player in players]
+        data = json.dumps(roster).encode('utf-8')
+        if len(data) <= ROSTER_BYTES:
+            break
+    return data
+
+class SpectatorPublisher:
+    """Streams the match state each tick as the fields that changed since the previous tick."""
+    def __init__(self, name=SPECTATOR_RING):
+        try:
+            self.ring = SpectatorRing(name, create=True)
+        except FileExistsError:
+            existing = SpectatorRing(name)
+            owner = int(existing.header[OWNER_PID])
+            if owner_alive(owner):
+                existing.close()  # Another game is publishing under this name; leave it alone
+                name = f"{name}_{os.getpid()}"
+                print(f"Spectator ring in use by process {owner}; run `python spectator.py {name}` to watch this game")
+            else:
+                existing.close(unlink=True)  # Left behind by a crashed run
+            self.ring = SpectatorRing(name, create=True)
+        self.name = name
+        self.state = np.zeros(STATE_INTS, np.int32)
+        self.previous = np.zeros(STATE_INTS, np.int32)
+        self.views = state_views(self.state.data)
+        self.written_marks = [0] * MAX_PLAYERS
+        self.roster = b""
+        self.since_keyframe = 0
+        atexit.register(self.close)
+
+    def start(self, game):
+        """Begins a match; the first frame is a keyframe with the new roster."""
+        self.state[:] = 0
+        self.written_marks = [0] * MAX_PLAYERS
+        self.roster = encode_roster(game.players)
+        self.since_keyframe = KEYFRAME_INTERVAL
+
+    def publish(self, game):
+        """Packs the game and writes a delta, or a keyframe when one is due or smaller."""
+        players, marks, targets, counts = self.views
+        pack_game(game, players, marks, targets, counts, self.written_marks)
+        changed = np.flatnonzero(self.state != self.previous).astype(np.int32)
+        self.since_keyframe += 1
+        if self.since_keyframe >= KEYFRAME_INTERVAL or len(changed) * 8 >= BUFFER_BYTES:
+            self.ring.write(KEYFRAME, np.concatenate((self.state.view(np.uint8), np.frombuffer(self.roster, np.uint8))))
+            self.since_keyframe = 0
+        else:
+            delta = np.concatenate((changed, self.state[changed]))
+            self.ring.write(DELTA, delta.view(np.uint8))
+        self.previous[:] = self.state
+
+    def end(self):
+        """Tells viewers the match is over."""
+        self.ring.write(END, np.zeros(0, np.uint8))
+
+    def close(self):
+        if self.ring is not None:
+            self.ring.close(unlink=True)
+            self.ring = None
+
+class SpectatorClient:
+    """Follows a spectator ring and keeps a local copy of the latest state."""
+    def __init__(self, name=SPECTATOR_RING):
+        self.ring = SpectatorRing(name)
+        self.state = np.zeros(STATE_INTS, np.int32)
+        self.views = state_views(self.state.data)
+        self.roster = []
+        self.next_sequence = None  # None until a keyframe has been applied
+        self.live = False
+        self.frames = 0
+        self.resyncs = 0
+
+    def resync(self):
+        """Jumps to the newest keyframe."""
+        self.next_sequence = None
+        keyframe = int(self.ring.header[LAST_KEYFRAME])
+        if keyframe:
+            self.resyncs += bool(self.frames)  # Joining is not a resync
+            self.next_sequence = keyframe
+
+    def poll(self):
+        """Applies every frame published since the last poll; returns how many were applied."""
+        applied = 0
+        if self.next_sequence is None:
+            self.resync()
+            if self.next_sequence is None:
+                return 0
+        head = int(self.ring.header[HEAD_SEQUENCE])
+        if head - self.next_sequence >= RING_SLOTS:
+            self.resync()
+        while self.next_sequence is not None and self.next_sequence <= head:
+            frame = self.ring.read(self.next_sequence)
+            if frame is None:
+                self.resync()  # Overtaken by the writer
+                continue
+            kind, payload = frame
+            if kind == KEYFRAME:
+                self.state[:] = payload[:BUFFER_BYTES].view(np.int32)
+                self.roster = [(entry['name'], tuple(entry['color'])) for entry in json.loads(payload[BUFFER_BYTES:].tobytes())]
+                self.live = True
+            elif kind == DELTA and self.live:
+                values = payload.view(np.int32)
+                half = len(values) // 2
+                self.state[values[:half]] = values[half:]
+            elif kind == END:
+                self.live = False
+            self.next_sequence += 1
+            applied += 1
+        self.frames += applied
+        return applied
+
+    def close(self):
+        self.ring.close()
+
+def viewer(name, screen_width=800, screen_height=600):
+    """A lobby-screen window that renders the stream until closed."""
+    from render_backend import SurfaceBackend
+    pygame.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Shooter - spectator")
+    backend = SurfaceBackend(screen)
+    background = pygame.transform.scale(
+        pygame.image.load('game_background.jpg').convert(), (screen_width, screen_height - 50)
+    )
+    font = load_font(40)
+    hud_font = load_font(22)
+    clock = pygame.time.Clock()
+    client = None
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+        if client is None:
+            try:
+                client = SpectatorClient(name)
+            except FileNotFoundError:
+                pass  # The game is not running yet
+        if client is not None:
+            client.poll()
+        if client is not None and client.live:
+            draw_state(backend, background, font, hud_font, client.roster, screen_width, 50, *client.views)
+        else:
+            screen.fill((0, 0, 0))
+            backend.text("Waiting for a match...", (screen_width // 2, screen_height // 2), font, (255, 255, 255), anchor="center")
+        backend.flip()
+        clock.tick(30)
+
+if __name__ == "__main__":
+    # Usage: python spectator.py [ring name] - defaults to SHOOTER_SPECTATOR_RING
+    viewer(sys.argv[1] if len(sys.argv) > 1 else SPECTATOR_RING)
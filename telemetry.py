@@ -0,0 +1,74 @@
+import atexit
+import queue
+import threading
+from database import connect, transaction, with_retry
+
+SHOT_BATCH_SIZE = 256  # Shots buffered before a batch is handed to the writer
+
+INSERT_SHOT = """
+    INSERT INTO shots (match_uuid, player_uuid, x, y, hit, target_type,
+                       base_points, multiplier, streak_bonus, time_left)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def ensure_shots_schema(conn):
+    """Creates the shots table and links matches to it through match_uuid."""
+    c = conn.cursor()
+    c.execute('''CREATE TABLE IF NOT EXISTS shots
+                 (shot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  match_uuid TEXT, player_uuid TEXT, x REAL, y REAL, hit INTEGER,
+                  target_type TEXT, base_points INTEGER, multiplier INTEGER,
+                  streak_bonus INTEGER, time_left INTEGER)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_shots_player ON shots (player_uuid, match_uuid)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_shots_match ON shots (match_uuid)")
+    columns = [row[1] for row in c.execute("PRAGMA table_info(matches)")]
+    if 'match_uuid' not in columns:
+        c.execute("ALTER TABLE matches ADD COLUMN match_uuid TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_matches_match_uuid ON matches (match_uuid)")
+    conn.commit()
+
+class ShotRecorder:
+    """Buffers shot events in memory and writes them in batches from a worker thread."""
+    def __init__(self, db_path, batch_size=SHOT_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.buffer = []
+        self.batches = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="shot-writer", daemon=True)
+        self.worker.start()
+        atexit.register(self.close)  # Quitting from a menu or mid-match still writes the queued shots
+
+    def record(self, match_uuid, player_uuid, x, y, hit, target_type,
+               base_points, multiplier, streak_bonus, time_left):
+        """Buffers one shot; only hands off work when a batch fills up."""
+        self.buffer.append((match_uuid, player_uuid, x, y, int(hit), target_type,
+                            base_points, multiplier, streak_bonus, time_left))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Queues the buffered shots for writing; call at match end."""
+        if self.buffer:
+            self.batches.put(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        """Flushes and waits for the writer to finish."""
+        if not self.worker.is_alive():
+            return
+        self.flush()
+        self.batches.put(None)
+        self.worker.join()
+
+    def _run(self):
+        conn = connect(self.db_path)
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            try:
+                # One transaction per batch, retried if another cabinet holds the lock
+                with_retry(lambda: transaction(conn, lambda c: c.executemany(INSERT_SHOT, batch)))
+            except Exception as e:  # Lose this batch, not every batch after it
+                print(f"Dropped {len(batch)} shots: {e}")
+        conn.close()
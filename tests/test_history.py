@@ -0,0 +1,48 @@
+from database import connect
+from history import MatchHistory, ensure_history_indexes, PAGE_SIZE
+
+def make_database(path, matches):
+    conn = connect(str(path))
+    conn.execute("CREATE TABLE users (uuid TEXT PRIMARY KEY, username TEXT UNIQUE, password TEXT)")
+    conn.execute("""CREATE TABLE matches (match_id INTEGER PRIMARY KEY AUTOINCREMENT, player1_uuid TEXT,
+                    player2_uuid TEXT, player1_score INTEGER, player2_score INTEGER, timestamp DATETIME)""")
+    conn.executemany("INSERT INTO users VALUES (?, ?, '')", [('me', 'me'), ('a', 'alice'), ('b', 'bob')])
+    conn.executemany("INSERT INTO matches (player1_uuid, player2_uuid, player1_score, player2_score, timestamp) "
+                     "VALUES (?, ?, ?, ?, ?)", matches)
+    ensure_history_indexes(conn)
+    conn.close()
+
+def all_pages(history):
+    labels = []
+    index = 0
+    while True:
+        labels += history.page(index).labels
+        if not history.has_next(index):
+            return labels
+        index += 1
+
+def test_pages_do_not_skip_or_repeat_matches_with_equal_timestamps(tmp_path):
+    # Both seats, many matches sharing one timestamp, and page boundaries inside the tie
+    matches = []
+    for i in range(PAGE_SIZE * 2 + 5):
+        timestamp = '2026-01-01 12:00:00' if i < PAGE_SIZE + 3 else '2026-01-02 12:00:00'
+        matches.append(('me', 'a', i, 100, timestamp) if i % 2 else ('b', 'me', 100, i, timestamp))
+    make_database(tmp_path / 'history.db', matches)
+    history = MatchHistory(str(tmp_path / 'history.db'), 'me')
+    labels = all_pages(history)
+    history.close()
+
+    scores = [int(label.split()[-2].split('-')[0]) for label in labels]
+    # Newest day first, then the tie broken by descending match_id
+    expected = list(range(PAGE_SIZE * 2 + 4, PAGE_SIZE + 2, -1)) + list(range(PAGE_SIZE + 2, -1, -1))
+    assert scores == expected
+
+def test_opponent_filter_pages_one_opponent(tmp_path):
+    matches = [('me', 'a' if i % 3 else 'b', i, 0, '2026-01-01 12:00:00') for i in range(PAGE_SIZE * 3)]
+    make_database(tmp_path / 'history.db', matches)
+    history = MatchHistory(str(tmp_path / 'history.db'), 'me', opponent_uuid='b')
+    labels = all_pages(history)
+    history.close()
+
+    assert len(labels) == PAGE_SIZE
+    assert all(' vs bob ' in label for label in labels)
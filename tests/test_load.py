@@ -0,0 +1,68 @@
+from database import Database
+from load import ensure_saved_games_schema, prune_saved_games, save_game_state
+
+class Player:
+    def __init__(self, uuid):
+        self.uuid = uuid
+
+class SavedGame:
+    def __init__(self, player1, player2, lineage_uuid=None):
+        self.player1, self.player2 = Player(player1), Player(player2)
+        self.lineage_uuid = lineage_uuid
+
+    def to_dict(self):
+        return {}
+
+def make_database(path):
+    db = Database(str(path))
+    def create(conn):
+        conn.execute("""CREATE TABLE saved_games (game_uuid TEXT PRIMARY KEY, player1_uuid TEXT, player2_uuid TEXT,
+                        game_state TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+        ensure_saved_games_schema(conn)
+    db.write(create)
+    return db
+
+def insert_saves(db, saves):
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO saved_games (game_uuid, player1_uuid, player2_uuid, game_state, timestamp) VALUES (?, ?, ?, '{}', ?)",
+        saves))
+
+def saves_of(db):
+    return [row[0] for row in db.query("SELECT game_uuid FROM saved_games ORDER BY timestamp, rowid")]
+
+def test_prune_keeps_newest_saves_of_the_pair_in_either_seat_order(tmp_path):
+    db = make_database(tmp_path / 'saves.db')
+    insert_saves(db, [
+        ('ab1', 'a', 'b', '2026-01-01 10:00:00'),
+        ('ba2', 'b', 'a', '2026-01-02 10:00:00'),
+        ('ab3', 'a', 'b', '2026-01-03 10:00:00'),
+        ('ba4', 'b', 'a', '2026-01-04 10:00:00'),
+        ('ac1', 'a', 'c', '2026-01-01 09:00:00'),  # Another pair is left alone
+    ])
+    assert db.write(prune_saved_games, 'b', 'a', 2) == 2
+    assert saves_of(db) == ['ac1', 'ab3', 'ba4']
+    db.close()
+
+def test_resaving_replaces_the_save_it_was_resumed_from(tmp_path):
+    db = make_database(tmp_path / 'saves.db')
+    game = SavedGame('a', 'b')
+    save_game_state(game, db)
+    first = saves_of(db)
+    assert len(first) == 1 and game.lineage_uuid == first[0]
+
+    save_game_state(game, db)  # Same lineage: the first save is replaced
+    second = saves_of(db)
+    assert len(second) == 1 and second != first
+    assert db.query_one("SELECT lineage_uuid FROM saved_games")[0] == first[0]
+
+    save_game_state(SavedGame('b', 'a'), db)  # A new match of the same pair adds a save
+    assert len(saves_of(db)) == 2
+    db.close()
+
+def test_saving_prunes_the_pair_to_the_retention_limit(tmp_path):
+    db = make_database(tmp_path / 'saves.db')
+    insert_saves(db, [(f'old{i}', 'a', 'b', f'2020-01-0{i + 1} 10:00:00') for i in range(4)])
+    game = SavedGame('b', 'a')
+    save_game_state(game, db, keep=3)
+    assert saves_of(db) == ['old2', 'old3', game.lineage_uuid]
+    db.close()
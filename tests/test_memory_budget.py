@@ -0,0 +1,19 @@
+import pygame
+from memory_budget import census
+from render_backend import load_font, track_surface
+
+def test_census_counts_font_held_only_by_a_local():
+    pygame.font.init()
+    before = census()['fonts']
+    font = load_font(20)
+    assert census()['fonts'] == before + 1
+    del font
+    assert census()['fonts'] == before
+
+def test_census_counts_tracked_surface_pixels():
+    before = census()
+    surface = track_surface(pygame.Surface((800, 600), 0, 32))
+    after = census()
+    assert after['surfaces'] == before['surfaces'] + 1
+    assert after['surface_mb'] - before['surface_mb'] >= 800 * 600 * 4 / 1e6
+    del surface
@@ -0,0 +1,51 @@
+import itertools
+import math
+import random
+from spawn import SpawnPlacer
+
+class Target:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+def place_targets(placer, count, avoid=()):
+    targets = []
+    for _ in range(count):
+        target = Target(*placer.place(avoid))
+        placer.occupy(target)
+        targets.append(target)
+    return targets
+
+def test_targets_keep_min_spacing_and_stay_in_bounds():
+    random.seed(1)
+    placer = SpawnPlacer(800, 600)
+    targets = place_targets(placer, 40)
+    for a, b in itertools.combinations(targets, 2):
+        assert math.hypot(a.x - b.x, a.y - b.y) >= placer.min_spacing
+    for target in targets:
+        assert placer.left <= target.x <= placer.right
+        assert placer.top <= target.y <= placer.bottom
+
+def test_targets_keep_clear_of_avoided_points():
+    random.seed(2)
+    placer = SpawnPlacer(800, 600)
+    cursors = [(200, 300), (600, 300)]
+    for target in place_targets(placer, 20, avoid=cursors):
+        assert all(math.hypot(target.x - x, target.y - y) >= placer.min_spacing for x, y in cursors)
+
+def test_crowded_field_still_places_in_bounds():
+    random.seed(3)
+    placer = SpawnPlacer(200, 200)
+    for target in place_targets(placer, 50):
+        assert placer.left <= target.x <= placer.right
+        assert placer.top <= target.y <= placer.bottom
+
+def test_release_frees_the_position():
+    random.seed(4)
+    placer = SpawnPlacer(800, 600)
+    targets = place_targets(placer, 10)
+    for target in targets[:5]:
+        placer.release(target)
+    assert sorted(map(id, placer.items)) == sorted(map(id, targets[5:]))
+    assert sum(len(items) for items in placer.grid.values()) == 5
+    assert placer.clearance(targets[0].x, targets[0].y) == min(
+        placer.min_spacing, *(math.hypot(t.x - targets[0].x, t.y - targets[0].y) for t in targets[5:]))